@@ -0,0 +1,198 @@
+"""Drive unclogger loggers under concurrent load and report how they scale.
+
+Runs a number of workers — either OS threads or asyncio tasks — that each bind
+some request-like context with `context_bind` and then emit a fixed number of
+events through a `get_logger` logger. Output goes to a single stdlib stream handler
+(by default writing to the null device, so the disk does not skew the results),
+whose lock is instrumented to measure how long the workers wait to acquire it. With
+`--buffered`, the output goes through per-thread buffers instead.
+
+Reports the throughput, the p50/p99/p999 latency of individual logging calls, and
+the total time spent waiting on the handler lock.
+
+Usage: python scripts/stress.py {threads,asyncio} WORKERS [--events N] [--output PATH] [--buffered]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import TracebackType
+
+import unclogger
+from unclogger.handlers import ThreadBufferedHandler
+
+# Percentiles included in the report.
+PERCENTILES = (50, 99, 99.9)
+
+
+class TimedLock:
+    """Wrapper around a handler lock measuring the time spent waiting to acquire it."""
+
+    def __init__(self, lock: threading.RLock) -> None:
+        self._lock = lock
+        self._local = threading.local()
+        self._totals: list[list[int]] = []
+        self._register = threading.Lock()
+
+    def _counter(self) -> list[int]:
+        counter = getattr(self._local, "counter", None)
+        if counter is None:
+            # one counter per thread, so measuring does not add contention of its own
+            counter = self._local.counter = [0, 0]
+            with self._register:
+                self._totals.append(counter)
+        return counter
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """Acquire the wrapped lock, recording the wait time."""
+        start = time.perf_counter_ns()
+        acquired = self._lock.acquire(blocking, timeout)
+        counter = self._counter()
+        counter[0] += time.perf_counter_ns() - start
+        counter[1] += 1
+        return acquired
+
+    def release(self) -> None:
+        """Release the wrapped lock."""
+        self._lock.release()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+    @property
+    def wait_ns(self) -> int:
+        """Total time spent waiting for the lock, across all threads."""
+        return sum(counter[0] for counter in self._totals)
+
+    @property
+    def acquisitions(self) -> int:
+        """Total number of times the lock was acquired, across all threads."""
+        return sum(counter[1] for counter in self._totals)
+
+
+def install_handler(output: str, buffered: bool = False) -> TimedLock:
+    """Replace the root handlers with a single instrumented stream handler."""
+    stream = Path(output).open("w")  # closed at interpreter exit
+    handler = ThreadBufferedHandler(stream) if buffered else logging.StreamHandler(stream)
+    unclogger.bridge(handler)
+    lock = TimedLock(handler.lock)
+    handler.lock = lock  # type: ignore[assignment]
+    logging.getLogger().handlers = [handler]
+    return lock
+
+
+def log_event(logger: unclogger.Unclogger, sequence: int, latencies: list[int]) -> None:
+    """Emit a single event, recording the latency of the call."""
+    start = time.perf_counter_ns()
+    logger.info("request handled", path="/api/items", status=200, sequence=sequence)
+    latencies.append(time.perf_counter_ns() - start)
+
+
+def run_threads(workers: int, events: int) -> list[list[int]]:
+    """Run the workload in OS threads, starting them all at once."""
+    latencies: list[list[int]] = [[] for _ in range(workers)]
+    barrier = threading.Barrier(workers)
+
+    def worker(index: int) -> None:
+        unclogger.context_bind(request_id=f"req-{index}", user_id=index, worker="thread")
+        logger = unclogger.get_logger(f"stress.worker.{index % 8}")
+        barrier.wait()
+        for sequence in range(events):
+            log_event(logger, sequence, latencies[index])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def run_tasks(workers: int, events: int) -> list[list[int]]:
+    """Run the workload in asyncio tasks, yielding to the loop between events."""
+    latencies: list[list[int]] = [[] for _ in range(workers)]
+
+    async def worker(index: int) -> None:
+        unclogger.context_bind(request_id=f"req-{index}", user_id=index, worker="task")
+        logger = unclogger.get_logger(f"stress.worker.{index % 8}")
+        for sequence in range(events):
+            log_event(logger, sequence, latencies[index])
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        await asyncio.gather(*(worker(index) for index in range(workers)))
+
+    asyncio.run(main())
+    return latencies
+
+
+RUNNERS: dict[str, Callable[[int, int], list[list[int]]]] = {
+    "threads": run_threads,
+    "asyncio": run_tasks,
+}
+
+
+def percentile(ordered: list[int], value: float) -> int:
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = max(round(value / 100 * len(ordered)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def main() -> None:
+    """Parse arguments, run the workload and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("mode", choices=sorted(RUNNERS), help="how to run the workers")
+    parser.add_argument("workers", type=int, help="number of threads or asyncio tasks")
+    parser.add_argument("--events", type=int, default=10_000, help="events per worker")
+    parser.add_argument("--output", default=os.devnull, help="file receiving the log output")
+    parser.add_argument(
+        "--buffered", action="store_true", help="write through per-thread output buffers"
+    )
+    parser.add_argument("--summary", action="store_true", help="print a single-line report")
+    args = parser.parse_args()
+
+    lock = install_handler(args.output, args.buffered)
+    start = time.perf_counter_ns()
+    latencies = RUNNERS[args.mode](args.workers, args.events)
+    logging.getLogger().handlers[0].flush()
+    elapsed = time.perf_counter_ns() - start
+
+    ordered = sorted(latency for worker in latencies for latency in worker)
+    total = len(ordered)
+    throughput = total / (elapsed / 1e9)
+    p50, p99, p999 = (percentile(ordered, value) / 1000 for value in PERCENTILES)
+    wait_ms = lock.wait_ns / 1e6
+    wait_share = lock.wait_ns / sum(ordered) * 100
+
+    if args.summary:
+        print(
+            f"{args.mode:>8} {args.workers:>4}  {throughput:>10.0f} ev/s  "
+            f"p50 {p50:>8.1f}us  p99 {p99:>8.1f}us  p999 {p999:>9.1f}us  "
+            f"lock wait {wait_share:>5.1f}%"
+        )
+        return
+    print(f"mode:            {args.mode} ({args.workers} workers, {args.events} events each)")
+    print(f"events:          {total} in {elapsed / 1e9:.3f}s")
+    print(f"throughput:      {throughput:.0f} events/s")
+    print(f"latency p50:     {p50:.1f}us")
+    print(f"latency p99:     {p99:.1f}us")
+    print(f"latency p999:    {p999:.1f}us")
+    print(f"lock acquired:   {lock.acquisitions} times")
+    print(f"lock wait:       {wait_ms:.1f}ms ({wait_share:.1f}% of time spent logging)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def attach_handler():
+    """
+    Attach handlers to named standard library loggers for the duration of a test.
+
+    The returned function adds the handler to the logger with the given name and stops
+    the logger from propagating to the root logger; on teardown, the handlers are
+    removed and closed, and the propagation is restored.
+    """
+    attached = []
+
+    def attach(name, handler):
+        std_logger = logging.getLogger(name)
+        std_logger.addHandler(handler)
+        std_logger.propagate = False
+        attached.append((std_logger, handler))
+        return std_logger
+
+    yield attach
+    for std_logger, handler in reversed(attached):
+        std_logger.removeHandler(handler)
+        std_logger.propagate = True
+        handler.close()
@@ -0,0 +1,166 @@
+import asyncio
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+import unclogger
+from unclogger import get_logger
+from unclogger.aio import SINKS, AsyncSink, drain
+
+LOGGER_NAME = "test async logger"
+
+
+class RecordingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.threads = set()
+
+    def write(self, text):
+        self.writes += 1
+        self.threads.add(threading.get_ident())
+        return super().write(text)
+
+
+@pytest.fixture
+def output():
+    return RecordingStream()
+
+
+@pytest.fixture
+def sink(output, attach_handler):
+    handler = AsyncSink(output)
+    attach_handler(LOGGER_NAME, handler)
+    yield handler
+    unclogger.processors.CUSTOM_PROCESSORS.clear()
+
+
+def detach_capture_handlers(sink):
+    # pytest attaches its capture handlers to non-propagating loggers, which would make
+    # the asynchronous methods run the blocking handlers in a separate thread
+    logging.getLogger(LOGGER_NAME).handlers = [sink]
+
+
+def events(output):
+    return [json.loads(line)["event"] for line in output.getvalue().splitlines()]
+
+
+def test_queued_lines_are_written_in_a_single_call_off_the_loop(output, sink):
+    async def main():
+        logger = get_logger(LOGGER_NAME)
+        for index in range(10):
+            logger.warning(f"message {index}")
+        assert output.getvalue() == ""
+        await drain()
+
+    asyncio.run(main())
+
+    assert events(output) == [f"message {index}" for index in range(10)]
+    assert output.writes == 1
+    assert threading.get_ident() not in output.threads
+
+
+def test_pending_lines_are_written_when_loop_finishes(output, sink):
+    async def main():
+        get_logger(LOGGER_NAME).warning("test message")
+
+    asyncio.run(main())
+
+    assert events(output) == ["test message"]
+
+
+def test_lines_are_written_immediately_outside_of_loop(output, sink):
+    get_logger(LOGGER_NAME).warning("test message")
+
+    assert events(output) == ["test message"]
+
+
+def test_async_methods_render_on_loop_thread(output, sink):
+    threads = []
+
+    def recorder(logger, name, event_dict):
+        threads.append(threading.get_ident())
+        return event_dict
+
+    unclogger.add_processors(recorder)
+    detach_capture_handlers(sink)
+
+    async def main():
+        logger = get_logger(LOGGER_NAME)
+        await logger.awarning("first message")
+        await logger.aerror("second message")
+        await drain()
+
+    asyncio.run(main())
+
+    assert events(output) == ["first message", "second message"]
+    assert threads == [threading.get_ident()] * 2
+
+
+def test_async_methods_wait_when_output_exceeds_high_water(output, sink):
+    sink.high_water = 0
+    detach_capture_handlers(sink)
+
+    async def main():
+        await get_logger(LOGGER_NAME).awarning("test message")
+        return sink.pending_bytes
+
+    assert asyncio.run(main()) == 0
+    assert events(output) == ["test message"]
+
+
+def test_aclose_writes_output_and_closes_sink(output, sink):
+    async def main():
+        get_logger(LOGGER_NAME).warning("test message")
+        await sink.aclose()
+
+    asyncio.run(main())
+
+    assert events(output) == ["test message"]
+    assert sink not in SINKS
+
+
+def test_async_methods_use_thread_for_loggers_with_blocking_handlers(
+    output, sink, attach_handler
+):
+    threads = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            threads.append(threading.get_ident())
+
+    attach_handler("test blocking logger", RecordingHandler())
+
+    async def main():
+        await get_logger("test blocking logger").awarning("test message")
+
+    asyncio.run(main())
+
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_lines_are_written_after_loop_is_closed(output, sink):
+    loop = asyncio.new_event_loop()
+
+    async def main():
+        get_logger(LOGGER_NAME).warning("first message")
+
+    loop.run_until_complete(main())
+    pending = asyncio.all_tasks(loop)
+    loop.close()
+    logger = get_logger(LOGGER_NAME)
+    logger.warning("second message")
+    logger.warning("third message")
+
+    assert events(output) == ["first message", "second message", "third message"]
+    assert sink.pending_bytes == 0
+    assert not pending  # asyncio would report a pending task when it is collected
+
+
+def test_unclogger_overrides_structlog_dispatch():
+    # fails if Structlog changes the private method, so the override is skipped
+    assert "_dispatch_to_sync" in vars(unclogger.Unclogger)
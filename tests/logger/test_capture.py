@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from unclogger import get_logger
+from unclogger.testing import capture_events
+
+
+def test_events_are_captured_before_rendering(caplog):
+    caplog.set_level("INFO")
+
+    with capture_events() as events:
+        get_logger("test logger").info("test message", foo=123)
+
+    assert len(events) == 1
+    assert events[0]["event"] == "test message"
+    assert events[0]["level"] == "info"
+    assert events[0]["logger"] == "test logger"
+    assert events[0]["foo"] == 123
+    assert json.loads(caplog.messages[0])["foo"] == 123
+
+
+def test_events_are_not_rendered_when_rendering_is_disabled(caplog):
+    caplog.set_level("INFO")
+
+    with capture_events(render=False) as events:
+        get_logger("test logger").info("test message")
+
+    assert events.messages == ["test message"]
+    assert caplog.messages == []
+
+
+def test_events_are_not_captured_outside_context(caplog):
+    caplog.set_level("INFO")
+    logger = get_logger("test logger")
+
+    with capture_events() as events:
+        logger.info("first message")
+    logger.info("second message")
+
+    assert events.messages == ["first message"]
+    assert len(caplog.messages) == 2
+
+
+@pytest.mark.parametrize(
+    "criteria, expected",
+    (
+        ({"level": "warning"}, ["second", "third"]),
+        ({"level": "WARNING", "logger": "logger 2"}, ["third"]),
+        ({"foo": 123}, ["first", "third"]),
+        ({"foo": 123, "bar": "abc"}, []),
+    ),
+)
+def test_captured_events_are_filtered(caplog, criteria, expected):
+    caplog.set_level("INFO")
+
+    with capture_events() as events:
+        get_logger("logger 1").info("first", foo=123)
+        get_logger("logger 1").warning("second", foo=456)
+        get_logger("logger 2").warning("third", foo=123)
+
+    assert events.filter(**criteria).messages == expected
+
+
+def test_log_events_fixture_captures_events(caplog, log_events):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info("test message", foo=123)
+
+    assert log_events.filter(level="info", foo=123).messages == ["test message"]
+    assert caplog.messages == []
+
+
+def test_nested_captures_are_removed_independently(log_events):
+    logger = get_logger("test logger")
+
+    with capture_events(render=False) as events:
+        logger.warning("first")
+    logger.warning("second")
+
+    assert events.messages == ["first"]
+    assert log_events.messages == ["first", "second"]
@@ -0,0 +1,217 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from unclogger import bridge, get_logger
+from unclogger.collector import Collector, CollectorHandler, _reset_collector_handlers
+
+LOGGER_NAME = "test collected logger"
+
+
+class _Output(io.BytesIO):
+    def close(self):
+        pass  # keep the value readable after the collector is closed
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited in length, so pytest's tmp_path may be too long
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory) / "logs.sock"
+
+
+@pytest.fixture
+def output():
+    return _Output()
+
+
+def _start(path, output):
+    collector = Collector(path, output, max_line_bytes=1024)
+    thread = threading.Thread(target=collector.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    return collector, thread
+
+
+def _stop(collector, thread):
+    collector.shutdown()
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def collector(socket_path, output):
+    collector, thread = _start(socket_path, output)
+    yield collector
+    _stop(collector, thread)
+
+
+@pytest.fixture
+def handler(socket_path, attach_handler):
+    handler = bridge(CollectorHandler(socket_path, interval=60, retry_interval=0.01))
+    attach_handler(LOGGER_NAME, handler)
+    return handler
+
+
+def _records(output, count):
+    deadline = time.monotonic() + 5
+    while len(output.getvalue().splitlines()) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_lines_are_tagged_with_pid(output, collector, handler):
+    logger = get_logger(LOGGER_NAME)
+
+    logger.info("first message", foo="abc")
+    logger.info("second message")
+    assert output.getvalue() == b""
+    handler.flush()
+
+    records = _records(output, 2)
+    assert [record["event"] for record in records] == ["first message", "second message"]
+    assert all(record["pid"] == os.getpid() for record in records)
+    assert records[0]["foo"] == "abc"
+
+
+def test_error_level_records_are_sent_immediately(output, collector, handler):
+    logger = get_logger(LOGGER_NAME)
+
+    logger.info("first message")
+    logger.error("second message")
+
+    records = _records(output, 2)
+    assert [record["event"] for record in records] == ["first message", "second message"]
+
+
+def test_lines_are_buffered_until_collector_is_available(socket_path, output, handler):
+    logger = get_logger(LOGGER_NAME)
+    logger.error("first message")
+
+    collector, thread = _start(socket_path, output)
+    try:
+        logger.info("second message")
+        handler.flush()
+        records = _records(output, 2)
+    finally:
+        _stop(collector, thread)
+    assert [record["event"] for record in records] == ["first message", "second message"]
+
+
+def test_handler_reconnects_after_collector_restart(socket_path, output, handler):
+    logger = get_logger(LOGGER_NAME)
+    collector, thread = _start(socket_path, output)
+    logger.error("first message")
+    _records(output, 1)
+    _stop(collector, thread)
+
+    logger.error("second message")  # fails on the closed connection, or is lost with it
+    logger.error("third message")
+
+    collector, thread = _start(socket_path, output)
+    try:
+        handler.flush()
+        records = _records(output, 3)
+    finally:
+        _stop(collector, thread)
+    events = [record["event"] for record in records]
+    assert events[0] == "first message"
+    assert events[-1] == "third message"
+
+
+def test_oldest_lines_are_dropped_over_the_limit(socket_path, output, attach_handler):
+    handler = bridge(CollectorHandler(socket_path, max_bytes=1024, interval=60))
+    attach_handler(LOGGER_NAME, handler)
+    logger = get_logger(LOGGER_NAME)
+    for index in range(50):
+        logger.info("test message", index=index)
+    assert handler.dropped > 0
+
+    collector, thread = _start(socket_path, output)
+    try:
+        handler.flush()
+        records = _records(output, 50 - handler.dropped)
+    finally:
+        _stop(collector, thread)
+    assert [record["index"] for record in records] == list(range(handler.dropped, 50))
+
+
+def test_buffer_and_connection_are_reset_after_fork(output, collector, handler):
+    logger = get_logger(LOGGER_NAME)
+    logger.error("parent message")
+    _records(output, 1)
+    logger.info("buffered message")
+    parent_socket = handler._socket
+
+    _reset_collector_handlers()
+
+    assert handler._socket is None
+    assert not handler._lines
+    assert parent_socket.fileno() == -1
+
+
+def _connect(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(path))
+    return client
+
+
+def test_pid_header_split_across_reads(socket_path, output, collector):
+    with _connect(socket_path) as client:
+        client.sendall(b"123")
+        time.sleep(0.05)
+        client.sendall(b'4\n{"event": "test message"}\n')
+        records = _records(output, 1)
+
+    assert records == [{"pid": 1234, "event": "test message"}]
+
+
+def test_invalid_client_is_disconnected_without_stopping_collector(
+    socket_path, output, collector
+):
+    with _connect(socket_path) as invalid, _connect(socket_path) as oversized:
+        invalid.sendall(b'not a pid\n{"event": "invalid"}\n')
+        oversized.sendall(b"1\n" + b"x" * (collector.max_line_bytes + 1))
+        assert invalid.recv(1) == b""
+        assert oversized.recv(1) == b""
+
+    with _connect(socket_path) as client:
+        client.sendall(b'5\n{"event": "test message"}\n')
+        records = _records(output, 1)
+
+    assert records == [{"pid": 5, "event": "test message"}]
+
+
+def test_existing_pid_field_is_kept(socket_path, output, collector):
+    with _connect(socket_path) as client:
+        client.sendall(
+            b'5\n{"event": "first", "pid": 123}\n{"event": "second", "data": {"pid": 1}}\n'
+        )
+        records = _records(output, 2)
+
+    assert records == [
+        {"event": "first", "pid": 123},
+        {"pid": 5, "event": "second", "data": {"pid": 1}},
+    ]
+
+
+def test_logging_does_not_wait_for_stalled_collector(socket_path, attach_handler):
+    handler = bridge(CollectorHandler(socket_path, batch_bytes=1024, retry_interval=5))
+    attach_handler(LOGGER_NAME, handler)
+    # a collector that accepts connections, but never reads from them; closing it
+    # before the handler resets the stalled connection
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+        stalled.bind(str(socket_path))
+        stalled.listen()
+        logger = get_logger(LOGGER_NAME)
+        started = time.monotonic()
+        for index in range(200):
+            logger.error("test message", index=index, payload="x" * 10_000)
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 1
@@ -0,0 +1,136 @@
+import io
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from unclogger import get_logger, set_handler
+from unclogger.handlers import ThreadBufferedHandler, _reset_buffered_handlers
+
+LOGGER_NAME = "test buffered logger"
+
+
+@pytest.fixture
+def output():
+    return io.StringIO()
+
+
+@pytest.fixture
+def buffered_handler(output, attach_handler):
+    handler = ThreadBufferedHandler(output, max_bytes=1024, interval=60)
+    attach_handler(LOGGER_NAME, handler)
+    return handler
+
+
+def test_lines_are_buffered_until_size_threshold(output, buffered_handler):
+    logger = get_logger(LOGGER_NAME)
+
+    logger.info("test message", index=0)
+    assert output.getvalue() == ""
+
+    for index in range(1, 20):
+        logger.info("test message", index=index)
+
+    lines = output.getvalue().splitlines()
+    assert 0 < len(lines) < 20
+    assert [json.loads(line)["index"] for line in lines] == list(range(len(lines)))
+
+
+def test_error_level_records_flush_buffer(output, buffered_handler):
+    logger = get_logger(LOGGER_NAME)
+
+    logger.info("first message")
+    logger.error("second message")
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record["event"] for record in records] == ["first message", "second message"]
+
+
+def test_flush_writes_buffers_of_all_threads(output, buffered_handler):
+    def worker(index):
+        logger = get_logger(LOGGER_NAME)
+        for sequence in range(5):
+            logger.info("test message", worker=index, sequence=sequence)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    buffered_handler.flush()
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(records) == 20
+    for index in range(4):
+        sequences = [record["sequence"] for record in records if record["worker"] == index]
+        assert sequences == list(range(5))
+
+
+def test_stale_buffers_are_flushed_in_background(output):
+    handler = ThreadBufferedHandler(output, interval=0.01)
+    handler.emit(logging.makeLogRecord({"msg": "test message", "levelno": logging.INFO}))
+
+    deadline = time.monotonic() + 5
+    while not output.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    flushed = output.getvalue()
+    handler.close()
+
+    assert flushed == "test message\n"
+
+
+def test_flush_under_handler_lock_does_not_deadlock_with_emitting_threads(output):
+    # `logging.shutdown` holds the handler lock while calling `flush`
+    handler = ThreadBufferedHandler(output, max_bytes=1, interval=60)
+    record = logging.makeLogRecord({"msg": "test message", "levelno": logging.INFO})
+    stop = threading.Event()
+
+    def emitter():
+        while not stop.is_set():
+            handler.emit(record)
+
+    def flusher():
+        for _ in range(200):
+            handler.acquire()
+            try:
+                handler.flush()
+            finally:
+                handler.release()
+
+    threads = [threading.Thread(target=emitter, daemon=True) for _ in range(4)]
+    threads.append(threading.Thread(target=flusher, daemon=True))
+    for thread in threads:
+        thread.start()
+    threads[-1].join(timeout=10)
+    stop.set()
+    for thread in threads[:-1]:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    handler.close()
+    assert set(output.getvalue().splitlines()) == {"test message"}
+
+
+def test_buffers_are_discarded_in_forked_child(output, buffered_handler):
+    get_logger(LOGGER_NAME).info("test message")
+
+    _reset_buffered_handlers()
+    buffered_handler.flush()
+
+    assert output.getvalue() == ""
+
+
+def test_set_handler_replaces_root_handlers():
+    root = logging.getLogger()
+    previous = root.handlers[:]
+    existing = ThreadBufferedHandler(io.StringIO())
+    handler = ThreadBufferedHandler(io.StringIO())
+    try:
+        root.handlers = [existing]
+        set_handler(handler)
+        assert root.handlers == [handler]
+        assert existing._stopped.is_set()
+    finally:
+        root.handlers = previous
@@ -0,0 +1,97 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+import structlog
+
+import unclogger
+from unclogger import context_bind, context_clear, get_logger, lazy
+
+
+@pytest.fixture(autouse=True)
+def cleanup_processors():
+    yield
+    unclogger.processors.CUSTOM_PROCESSORS.clear()
+
+
+def test_lazy_value_is_resolved_in_log_output(caplog):
+    caplog.set_level("INFO")
+    compute = Mock(return_value={"abc": 123})
+
+    get_logger("test logger").info("test message", snapshot=lazy(compute, 1, depth=2))
+
+    record = json.loads(caplog.messages[0])
+    assert record["snapshot"] == {"abc": 123}
+    compute.assert_called_once_with(1, depth=2)
+
+
+def test_lazy_value_is_not_resolved_for_filtered_event(caplog):
+    caplog.set_level("INFO")
+    compute = Mock(return_value="abc")
+
+    get_logger("test logger").debug("test message", snapshot=lazy(compute))
+
+    assert caplog.messages == []
+    compute.assert_not_called()
+
+
+def test_lazy_value_is_not_resolved_for_dropped_event(caplog):
+    caplog.set_level("INFO")
+    compute = Mock(return_value="abc")
+
+    def drop(logger, name, event_dict):
+        raise structlog.DropEvent
+
+    unclogger.add_processors(drop)
+    get_logger("test logger").info("test message", snapshot=lazy(compute))
+
+    assert caplog.messages == []
+    compute.assert_not_called()
+
+
+def test_lazy_value_is_resolved_only_once(caplog):
+    caplog.set_level("INFO")
+    compute = Mock(return_value="abc")
+
+    def reader(logger, name, event_dict):
+        event_dict["copy"] = event_dict["snapshot"].value
+        return event_dict
+
+    unclogger.add_processors(reader, reader)
+    get_logger("test logger").info("test message", snapshot=lazy(compute))
+
+    record = json.loads(caplog.messages[0])
+    assert record["snapshot"] == record["copy"] == "abc"
+    compute.assert_called_once_with()
+
+
+def test_nested_lazy_value_is_resolved_in_log_output(caplog):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info("test message", items=[lazy(lambda: 123)])
+
+    record = json.loads(caplog.messages[0])
+    assert record["items"] == [123]
+
+
+def test_bound_lazy_value_is_resolved_for_every_event(caplog):
+    caplog.set_level("INFO")
+    counter = iter(range(10))
+    context_bind(context_value=lazy(next, counter))
+    logger = get_logger("test logger").bind(bound_value=lazy(next, counter))
+
+    try:
+        logger.info("first message", items=[lazy(next, counter)])
+        logger.info("second message", items=[lazy(next, counter)])
+    finally:
+        context_clear("context_value")
+
+    first, second = (json.loads(message) for message in caplog.messages)
+    assert {first["context_value"], first["bound_value"], *first["items"]} == {0, 1, 2}
+    assert {second["context_value"], second["bound_value"], *second["items"]} == {3, 4, 5}
+
+
+def test_module_is_not_shadowed_by_function():
+    import unclogger.deferred
+
+    assert unclogger.deferred.Lazy is type(lazy(int))
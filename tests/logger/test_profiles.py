@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from unclogger import get_logger, set_output_profile, set_size_limits
+from unclogger.profiles import OutputProfile
+
+
+@pytest.fixture(autouse=True)
+def reset_output_profile():
+    yield
+    set_output_profile(None)
+    set_size_limits()
+    get_logger("test logger").config.output_profile = None
+
+
+@pytest.mark.parametrize(
+    "profile, expected",
+    (
+        (OutputProfile(), {"foo": 123, "bar": None, "event": "test", "level": "info"}),
+        (OutputProfile(include=["event", "foo"]), {"foo": 123, "event": "test"}),
+        (OutputProfile(exclude=["bar", "level"]), {"foo": 123, "event": "test"}),
+        (OutputProfile(include=["event", "foo"], exclude=["foo"]), {"event": "test"}),
+        (
+            OutputProfile(aliases={"event": "msg", "level": "lvl"}),
+            {"foo": 123, "bar": None, "msg": "test", "lvl": "info"},
+        ),
+        (
+            OutputProfile(level_codes=True),
+            {"foo": 123, "bar": None, "event": "test", "level": 20},
+        ),
+        (OutputProfile(drop_empty=True), {"foo": 123, "event": "test", "level": "info"}),
+    ),
+)
+def test_profile_projects_event(profile, expected):
+    event_dict = {"foo": 123, "bar": None, "event": "test", "level": "info"}
+
+    assert profile(event_dict) == expected
+    assert list(profile(event_dict)) == list(expected)
+
+
+@pytest.mark.parametrize("value", (None, "", [], {}, ()))
+def test_profile_drops_empty_values(value):
+    profile = OutputProfile(drop_empty=True)
+
+    assert profile({"event": "test", "foo": value, "bar": 0, "baz": False}) == {
+        "event": "test",
+        "bar": 0,
+        "baz": False,
+    }
+
+
+def test_global_profile_is_applied_to_log_output(caplog):
+    caplog.set_level("INFO")
+    set_output_profile(OutputProfile(exclude=["logger"], aliases={"timestamp": "ts"}))
+
+    get_logger("test logger").info("test message", foo=123)
+
+    record = json.loads(caplog.messages[0])
+    assert set(record) == {"foo", "event", "level", "ts"}
+
+
+def test_logger_profile_takes_precedence_over_global_profile(caplog):
+    caplog.set_level("INFO")
+    set_output_profile(OutputProfile(exclude=["logger"]))
+    logger = get_logger("test logger")
+    logger.config.output_profile = OutputProfile(include=["event"])
+
+    logger.info("test message", foo=123)
+    get_logger("another logger").info("test message", foo=123)
+
+    assert json.loads(caplog.messages[0]) == {"event": "test message"}
+    assert set(json.loads(caplog.messages[1])) == {"foo", "event", "level", "timestamp"}
+
+
+def test_renamed_standard_fields_keep_size_limit_precedence(caplog):
+    caplog.set_level("INFO")
+    set_output_profile(OutputProfile(aliases={"timestamp": "ts", "event": "msg"}))
+    set_size_limits(event=400)
+
+    get_logger("test logger").info(
+        "test message", **{f"f{index}": "x" * 50 for index in range(10)}
+    )
+
+    record = json.loads(caplog.messages[0])
+    assert {"msg", "logger", "level", "ts"} <= set(record)
+    assert "__truncated__" in record
@@ -0,0 +1,154 @@
+import json
+import tracemalloc
+from collections import deque
+
+import pytest
+
+from unclogger import get_logger, set_size_limits
+from unclogger.rendering import MIN_SIZE_LIMIT, TRUNCATED_KEY, bounded_dumps
+
+
+@pytest.fixture(autouse=True)
+def reset_size_limits():
+    yield
+    set_size_limits()
+
+
+def test_output_without_limits_matches_json_dumps():
+    event_dict = {"foo": [1, 2.5, None, True], "bar": {"baz": "abc"}, "event": "message"}
+    assert bounded_dumps(event_dict) == json.dumps(event_dict)
+
+
+def test_non_string_keys_are_converted_like_json_dumps():
+    mapping = {True: 1, False: 2, None: 3, 4: 5, 6.5: 7, float("inf"): 8}
+    event_dict = {"event": "message", "mapping": mapping}
+
+    assert bounded_dumps(event_dict) == json.dumps(event_dict)
+
+
+def test_oversized_string_is_truncated_with_original_size():
+    event_dict = {"event": "message", "payload": "x" * 100_000}
+
+    output = bounded_dumps(event_dict, field_limit=200)
+
+    record = json.loads(output)
+    assert record["event"] == "message"
+    assert len(json.dumps(record["payload"])) <= 200
+    assert record["payload"].startswith("xxx")
+    assert record["payload"].endswith("<truncated: 100000 chars>")
+
+
+def test_truncated_string_with_escaped_characters_stays_within_limit():
+    event_dict = {"payload": "š\n" * 10_000}
+
+    output = bounded_dumps(event_dict, field_limit=200)
+
+    assert len(json.dumps(json.loads(output)["payload"])) <= 200
+
+
+def test_oversized_list_is_truncated_with_marker_item():
+    event_dict = {"items": list(range(100_000))}
+
+    output = bounded_dumps(event_dict, field_limit=300)
+
+    items = json.loads(output)["items"]
+    assert items[:3] == [0, 1, 2]
+    assert items[-1] == f"<truncated: {len(items) - 1} of 100000 items>"
+
+
+def test_oversized_bytes_are_truncated_with_original_size():
+    event_dict = {"payload": b"\x00" * 100_000}
+
+    output = bounded_dumps(event_dict, field_limit=200)
+
+    payload = json.loads(output)["payload"]
+    assert len(json.dumps(payload)) <= 200
+    assert payload.startswith("b'\\x00")
+    assert payload.endswith("<truncated: 100000 bytes>")
+
+
+@pytest.mark.parametrize(
+    "value", (set(range(100)), frozenset(range(100)), deque(range(100)), dict.fromkeys(range(100)).keys())
+)  # fmt: skip
+def test_oversized_collections_are_truncated_as_lists(value):
+    output = bounded_dumps({"items": value}, field_limit=200)
+
+    items = json.loads(output)["items"]
+    assert len(json.dumps(items)) <= 200
+    assert items[-1].startswith("<truncated: ")
+    assert items[-1].endswith(" of 100 items>")
+
+
+@pytest.mark.parametrize(
+    "factory", (lambda: b"x" * 20_000_000, lambda: set(range(1_000_000))), ids=("bytes", "set")
+)
+def test_truncation_of_large_values_allocates_bounded_memory(factory):
+    value = factory()
+    tracemalloc.start()
+    try:
+        bounded_dumps({"payload": value}, field_limit=200)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 100_000
+
+
+def test_oversized_nested_mapping_is_truncated_with_marker_key():
+    event_dict = {"data": {f"key_{index}": {"value": index} for index in range(10_000)}}
+
+    output = bounded_dumps(event_dict, field_limit=300)
+
+    data = json.loads(output)["data"]
+    assert data["key_0"] == {"value": 0}
+    assert data[TRUNCATED_KEY] == f"<truncated: {len(data) - 1} of 10000 keys>"
+
+
+def test_event_limit_keeps_standard_fields_and_marks_dropped_ones():
+    event_dict = {
+        **{f"field_{index}": "y" * 50 for index in range(100)},
+        "event": "message",
+        "logger": "test logger",
+        "level": "info",
+        "timestamp": "2021-02-18T21:59:40.102272Z",
+    }
+
+    output = bounded_dumps(event_dict, event_limit=1000)
+
+    assert len(output) <= 1000
+    record = json.loads(output)
+    assert record["event"] == "message"
+    assert record["logger"] == "test logger"
+    assert record["level"] == "info"
+    assert record["timestamp"] == "2021-02-18T21:59:40.102272Z"
+    assert record[TRUNCATED_KEY] == f"<truncated: {len(record) - 1} of 104 keys>"
+
+
+def test_values_are_converted_with_json_default():
+    class Foo:
+        def __repr__(self):
+            return "z" * 10_000
+
+    output = bounded_dumps({"foo": Foo()}, field_limit=200)
+
+    assert json.loads(output)["foo"].endswith("<truncated: 10000 chars>")
+
+
+def test_size_limits_are_applied_to_log_output(caplog):
+    caplog.set_level("INFO")
+    set_size_limits(field=200, event=1000)
+
+    logger = get_logger("test logger")
+    logger.info("test message", payload="x" * 100_000, items=list(range(100_000)))
+
+    assert len(caplog.messages[0]) <= 1000
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "test message"
+    assert record["payload"].endswith("<truncated: 100000 chars>")
+    assert record["items"][-1].startswith("<truncated:")
+
+
+@pytest.mark.parametrize("limits", ({"field": 10}, {"event": MIN_SIZE_LIMIT - 1}))
+def test_raises_an_exception_on_too_low_limits(limits):
+    with pytest.raises(ValueError):
+        set_size_limits(**limits)
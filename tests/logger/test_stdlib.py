@@ -0,0 +1,75 @@
+import io
+import json
+import logging
+
+import pytest
+
+from unclogger import bridge, context_bind, context_clear, get_logger
+from unclogger.testing import capture_events
+
+LOGGER_NAME = "test foreign logger"
+
+
+@pytest.fixture
+def output():
+    return io.StringIO()
+
+
+@pytest.fixture
+def foreign_logger(output, attach_handler):
+    yield attach_handler(LOGGER_NAME, bridge(logging.StreamHandler(output)))
+    context_clear()
+
+
+def test_foreign_record_is_rendered_as_json(output, foreign_logger):
+    foreign_logger.warning("user %s did %s", "alice", "something")
+
+    record = json.loads(output.getvalue())
+    assert len(record) == 4
+    assert record["event"] == "user alice did something"
+    assert record["logger"] == LOGGER_NAME
+    assert record["level"] == "warning"
+    assert "timestamp" in record
+
+
+def test_foreign_record_with_mapping_argument_is_rendered(output, foreign_logger):
+    foreign_logger.warning("user %(name)s", {"name": "alice"})
+
+    assert json.loads(output.getvalue())["event"] == "user alice"
+
+
+def test_foreign_record_includes_global_context(output, foreign_logger):
+    context_bind(request_id="abc")
+
+    foreign_logger.warning("test message")
+
+    assert json.loads(output.getvalue())["request_id"] == "abc"
+
+
+def test_foreign_record_includes_exception(output, foreign_logger):
+    try:
+        raise RuntimeError("this is an error")  # noqa: TRY301, TRY003
+    except RuntimeError:
+        foreign_logger.exception("test message")
+
+    record = json.loads(output.getvalue())
+    assert record["level"] == "error"
+    assert "RuntimeError: this is an error" in record["exception"]
+
+
+def test_native_record_is_not_rendered_again(output, foreign_logger):
+    get_logger(LOGGER_NAME).warning("test message", foo=123)
+
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["event"] == "test message"
+    assert record["foo"] == 123
+
+
+def test_foreign_record_dropped_by_processors_is_not_emitted(output, foreign_logger):
+    with capture_events(render=False) as events:
+        foreign_logger.warning("test message")
+
+    assert events.messages == ["test message"]
+    assert output.getvalue() == ""
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from unclogger import get_logger, set_template_fields
+
+
+@pytest.fixture(autouse=True)
+def reset_template_fields():
+    yield
+    set_template_fields(False)
+
+
+def test_template_fields_are_excluded_by_default(caplog):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info("user %s did %s", "alice", "something")
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "user alice did something"
+    assert "template" not in record
+    assert "positional_args" not in record
+
+
+def test_template_fields_are_included_in_log_output(caplog):
+    caplog.set_level("INFO")
+    set_template_fields()
+
+    get_logger("test logger").info("user %s did %s", "alice", "something")
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "user alice did something"
+    assert record["template"] == "user %s did %s"
+    assert record["positional_args"] == ["alice", "something"]
+
+
+def test_named_placeholders_are_formatted_with_mapping(caplog):
+    caplog.set_level("INFO")
+    set_template_fields()
+
+    get_logger("test logger").info("user %(name)s did %(action)s", {"name": "a", "action": "b"})
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "user a did b"
+    assert record["positional_args"] == {"name": "a", "action": "b"}
+
+
+def test_single_mapping_argument_is_formatted_as_value(caplog):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info("data: %s", {"abc": 123})
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "data: {'abc': 123}"
+
+
+def test_mismatched_arguments_are_kept_unformatted(caplog):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info("user %s did %s", "alice")
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "user %s did %s"
+    assert record["positional_args"] == ["alice"]
+
+
+@pytest.mark.parametrize(
+    "message, args",
+    (
+        ("user %s did %s", ("alice", "something", "else")),
+        ("user %(name)s did %(action)s", ({"name": "alice"},)),
+        ("count: %d", ("many",)),
+    ),
+)
+def test_mismatch_is_kept_unformatted(caplog, message, args):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info(message, *args)
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == message
+
+
+def test_unused_mapping_argument_is_ignored(caplog):
+    caplog.set_level("INFO")
+
+    get_logger("test logger").info("hello", {"abc": 123})
+
+    record = json.loads(caplog.messages[0])
+    assert record["event"] == "hello"
+    assert "positional_args" not in record
+
+
+def test_template_fields_do_not_replace_keyword_arguments(caplog):
+    caplog.set_level("INFO")
+    set_template_fields()
+    logger = get_logger("test logger")
+
+    logger.info("user %s logged in", "alice", template="login")
+    logger.info("no arguments", positional_args=[1, 2])
+
+    first, second = (json.loads(message) for message in caplog.messages)
+    assert first["template"] == "login"
+    assert first["positional_args"] == ["alice"]
+    assert second["positional_args"] == [1, 2]
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import structlog
+
+from unclogger.__main__ import main
+from unclogger.profiling import PROFILE_LOGGER, check_allocations, profile_allocations
+
+
+def test_profile_reports_allocations_per_stage():
+    processors = structlog.get_config()["processors"]
+
+    profile = profile_allocations(events=20)
+
+    assert profile["events"] == 20
+    assert profile["total"]["bytes"] > 0
+    assert profile["stages"]["bind"]["bytes"] > 0
+    assert "merge_contextvars" in profile["stages"]
+    assert "render_json" in profile["stages"]
+    assert profile["stages"]["render_json"]["bytes"] > 0
+    assert profile["stages"]["handler"]["bytes"] > 0
+    assert structlog.get_config()["processors"] == processors
+    assert logging.getLogger(PROFILE_LOGGER).handlers == []
+
+
+def test_profile_runs_custom_workload():
+    calls = []
+
+    def workload(logger, index):
+        calls.append(index)
+        logger.info("test message", index=index)
+
+    profile_allocations(events=10, workload=workload)
+
+    assert calls == [*range(10), *range(10), *range(10)]
+
+
+def test_check_passes_allocations_within_tolerance():
+    baseline = {"total": {"bytes": 1000.0, "blocks": 3.0}}
+    profile = {"total": {"bytes": 1090.0, "blocks": 5.0}}
+
+    assert check_allocations(profile, baseline, tolerance=0.1) == []
+
+
+def test_check_fails_allocations_above_tolerance():
+    baseline = {"total": {"bytes": 1000.0, "blocks": 3.0}}
+    profile = {"total": {"bytes": 1200.0, "blocks": 3.0}}
+
+    failures = check_allocations(profile, baseline, tolerance=0.1)
+
+    assert len(failures) == 1
+    assert "1200.0" in failures[0]
+
+
+def test_profile_command_fails_without_baseline_for_current_version(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"2.7": {"total": {"bytes": 1.0, "blocks": 1.0}}}))
+
+    result = main(["profile", "--events", "10", "--baseline", str(baseline)])
+
+    assert result == 1
+    assert "No baseline for Python" in capsys.readouterr().err
@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from unclogger.__main__ import main
+from unclogger.query import build_index, index_path, query
+
+RECORDS = [
+    {"event": "started", "logger": "app", "level": "info", "timestamp": "2021-02-12T10:00:00Z"},
+    {"user": "alice", "event": "login", "logger": "auth", "level": "info", "timestamp": "2021-02-12T11:00:00Z"},
+    {"user": "bob", "event": "denied", "logger": "auth", "level": "error", "timestamp": "2021-02-12T12:00:00Z"},
+    {"count": 3, "event": "retried", "logger": "app", "level": "warning", "timestamp": "2021-02-12T13:00:00Z"},
+    {"event": "failed", "logger": "app", "level": "error", "timestamp": "2021-02-12T14:00:00Z"},
+]  # fmt: skip
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    lines = [json.dumps(record) for record in RECORDS]
+    lines.insert(2, 'not json, but mentions "error"')
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def events(lines):
+    return [json.loads(line)["event"] for line in lines]
+
+
+@pytest.mark.parametrize(
+    "fields, expected",
+    (
+        ({}, ["started", "login", "denied", "retried", "failed"]),
+        ({"level": ["error"]}, ["denied", "failed"]),
+        ({"level": ["error", "warning"]}, ["denied", "retried", "failed"]),
+        ({"level": ["error"], "logger": ["auth"]}, ["denied"]),
+        ({"user": ["alice"]}, ["login"]),
+        ({"count": [3]}, ["retried"]),
+        ({"level": ["debug"]}, []),
+    ),
+)
+def test_query_selects_lines_by_fields(log_file, fields, expected):
+    assert events(query(log_file, fields)) == expected
+
+
+@pytest.mark.parametrize(
+    "since, until, expected",
+    (
+        ("2021-02-12T11:00", None, ["login", "denied", "retried", "failed"]),
+        (None, "2021-02-12T12:00", ["started", "login"]),
+        ("2021-02-12T11:30", "2021-02-12T13:30", ["denied", "retried"]),
+    ),
+)
+def test_query_selects_lines_by_time_range(log_file, since, until, expected):
+    assert events(query(log_file, since=since, until=until)) == expected
+
+
+@pytest.mark.parametrize(
+    "since, until, expected",
+    (
+        ("2021-02-12T11:00", None, ["login", "denied", "retried", "failed"]),
+        (None, "2021-02-12T12:00", ["started", "login"]),
+        ("2021-02-12T11:30", "2021-02-12T13:30", ["denied", "retried"]),
+    ),
+)
+def test_indexed_query_selects_lines_by_time_range(log_file, since, until, expected):
+    build_index(log_file, step=2)
+
+    assert events(query(log_file, since=since, until=until)) == expected
+
+
+def test_indexed_query_reads_lines_appended_after_indexing(log_file):
+    build_index(log_file, step=2)
+    record = {"event": "appended", "timestamp": "2021-02-12T15:00:00Z"}
+    with log_file.open("a") as output:
+        output.write(json.dumps(record) + "\n")
+
+    assert events(query(log_file, since="2021-02-12T14:00")) == ["failed", "appended"]
+
+
+def test_index_skips_blocks_outside_time_range(log_file):
+    index = build_index(log_file, step=2)
+
+    assert index_path(log_file).exists()
+    assert len(index["blocks"]) == 3
+    assert index["blocks"][0][2:] == ["2021-02-12T10:00:00Z", "2021-02-12T11:00:00Z"]
+
+
+def test_index_ignores_nested_timestamps(tmp_path):
+    path = tmp_path / "app.log"
+    records = [
+        {"payload": {"timestamp": "1999-01-01T00:00:00Z"}, "event": f"event {minute}",
+         "timestamp": f"2021-02-12T22:{minute:02}:00Z"}
+        for minute in range(10)
+    ]  # fmt: skip
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    index = build_index(path, step=2)
+
+    assert index["blocks"][0][2:] == ["2021-02-12T22:00:00Z", "2021-02-12T22:01:00Z"]
+    assert len(list(query(path, since="2021-02-12T22:05"))) == 5
+
+
+def test_index_of_replaced_file_is_ignored(log_file):
+    build_index(log_file, step=2)
+    record = {"event": "replaced", "timestamp": "2021-02-12T09:00:00Z"}
+    content = log_file.read_text()
+    log_file.write_text(json.dumps(record) + "\n" + content)
+
+    assert "replaced" in events(query(log_file, until="2021-02-12T10:00"))
+
+
+def test_query_command_prints_matching_lines(log_file, capsysbinary):
+    result = main(["query", str(log_file), "--level", "ERROR", "--where", "logger=app"])
+
+    assert result == 0
+    assert events(capsysbinary.readouterr().out.splitlines()) == ["failed"]
+
+
+def test_query_command_accepts_numeric_levels(tmp_path, capsysbinary):
+    path = tmp_path / "app.log"
+    path.write_text(
+        json.dumps({"event": "failed", "level": 40})
+        + "\n"
+        + json.dumps({"event": "ok", "level": 20})
+        + "\n"
+    )
+
+    result = main(["query", str(path), "--level", "40"])
+
+    assert result == 0
+    assert events(capsysbinary.readouterr().out.splitlines()) == ["failed"]
+
+
+def test_index_command_builds_index(log_file):
+    result = main(["index", str(log_file), "--step", "2"])
+
+    assert result == 0
+    assert index_path(log_file).exists()
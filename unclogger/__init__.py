@@ -2,10 +2,16 @@
 
 import logging as _std_logging
 
+from unclogger.deferred import lazy
+from unclogger.handlers import set_handler
 from unclogger.logger import Unclogger, context_bind, context_clear, get_logger, set_level
 from unclogger.processors import add_processors
+from unclogger.profiles import set_output_profile
+from unclogger.rendering import set_size_limits
+from unclogger.stdlib import bridge
+from unclogger.templates import set_template_fields
 
 getLogger = get_logger  # alias for compatibility with standard logging  # noqa: N816
 
-_std_logging.basicConfig(format="%(message)s")
+_std_logging.basicConfig(handlers=[bridge(_std_logging.StreamHandler())])
 set_level()
@@ -0,0 +1,163 @@
+"""Command line tools for working with unclogger output."""
+
+import argparse
+import json
+import signal
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from unclogger.collector import Collector
+from unclogger.query import INDEX_STEP, build_index, query
+
+
+def _field(value: str) -> tuple[str, Any]:
+    key, separator, raw = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got '{value}'")  # noqa: TRY003
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def _query(args: argparse.Namespace) -> int:
+    fields: dict[str, list[Any]] = {}
+    for key, value in args.where:
+        fields.setdefault(key, []).append(value)
+    if args.level:
+        # numeric levels match the output of profiles with `level_codes` enabled
+        fields["level"] = [
+            int(level) if level.isdigit() else level.lower() for level in args.level
+        ]
+    if args.logger:
+        fields["logger"] = args.logger
+    output = sys.stdout.buffer
+    try:
+        for line in query(args.file, fields, args.since, args.until, args.time_key):
+            output.write(line + b"\n")
+        output.flush()
+    except BrokenPipeError:  # e.g. piped to `head`
+        sys.stderr.close()
+    return 0
+
+
+def _index(args: argparse.Namespace) -> int:
+    index = build_index(args.file, args.time_key, args.step)
+    print(f"Indexed {index['size']} bytes in {len(index['blocks'])} blocks.", file=sys.stderr)
+    return 0
+
+
+def _collect(args: argparse.Namespace) -> int:
+    output = args.output.open("ab") if args.output is not None else sys.stdout.buffer
+    collector = Collector(args.socket, output)
+    signal.signal(signal.SIGTERM, lambda *_: collector.shutdown())
+    try:
+        collector.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.output is not None:
+            output.close()
+    return 0
+
+
+def _profile(args: argparse.Namespace) -> int:
+    # imported here, as it is only needed by this command
+    from unclogger.profiling import check_allocations, profile_allocations
+
+    profile = profile_allocations(args.events)
+    print(f"{'stage':<28}{'bytes/event':>14}{'blocks/event':>14}")
+    for name, stats in [*profile["stages"].items(), ("total", profile["total"])]:
+        print(f"{name:<28}{stats['bytes']:>14.1f}{stats['blocks']:>14.2f}")
+    if args.baseline is None:
+        return 0
+
+    version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save:
+        baselines[version] = profile
+        args.baseline.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Saved the baseline for Python {version} to {args.baseline}.", file=sys.stderr)
+        return 0
+    if version not in baselines:
+        # a missing baseline must not let the check pass unnoticed
+        print(f"No baseline for Python {version} in {args.baseline}.", file=sys.stderr)
+        return 1
+    failures = check_allocations(profile, baselines[version], args.tolerance)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Runs the command line interface.
+
+    Args:
+        argv: Command line arguments; defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(prog="python -m unclogger", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = commands.add_parser("query", help="print the matching lines of a log file")
+    query_parser.add_argument("file", help="log file with one JSON object per line")
+    query_parser.add_argument(
+        "--level", action="append", help="accepted log level, by name or numeric code"
+    )
+    query_parser.add_argument("--logger", action="append", help="accepted logger name")
+    query_parser.add_argument("--since", help="the earliest accepted timestamp")
+    query_parser.add_argument("--until", help="timestamps must be earlier than this")
+    query_parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        type=_field,
+        metavar="KEY=VALUE",
+        help="accepted value of a field; parsed as JSON if possible",
+    )
+    query_parser.add_argument("--time-key", default="timestamp", help="the timestamp field")
+    query_parser.set_defaults(handler=_query)
+
+    index_parser = commands.add_parser("index", help="build the timestamp index of a log file")
+    index_parser.add_argument("file", help="log file with one JSON object per line")
+    index_parser.add_argument("--time-key", default="timestamp", help="the timestamp field")
+    index_parser.add_argument(
+        "--step", type=int, default=INDEX_STEP, help="lines per index block"
+    )
+    index_parser.set_defaults(handler=_index)
+
+    collect_parser = commands.add_parser(
+        "collect", help="merge the log output of multiple processes sent over a socket"
+    )
+    collect_parser.add_argument("socket", help="location of the Unix domain socket")
+    collect_parser.add_argument(
+        "--output", type=Path, help="log file to append to; defaults to the standard output"
+    )
+    collect_parser.set_defaults(handler=_collect)
+
+    profile_parser = commands.add_parser(
+        "profile", help="measure memory allocations of the logging pipeline"
+    )
+    profile_parser.add_argument("--events", type=int, default=1000, help="events to log")
+    profile_parser.add_argument(
+        "--baseline", type=Path, help="compare allocations per event with this baseline file"
+    )
+    profile_parser.add_argument(
+        "--save", action="store_true", help="store the results in the baseline file instead"
+    )
+    profile_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="allowed relative increase over the baseline (default: 0.1)",
+    )
+    profile_parser.set_defaults(handler=_profile)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
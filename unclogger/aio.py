@@ -0,0 +1,183 @@
+"""Non-blocking output for asyncio applications."""
+
+import asyncio
+import logging as _std_logging
+import sys
+import threading
+import traceback
+from collections import deque
+from collections.abc import Iterable
+from typing import TextIO
+from weakref import WeakSet
+
+SINKS: "WeakSet[AsyncSink]" = WeakSet()
+
+
+class AsyncSink(_std_logging.Handler):
+    """
+    Handler writing the log output without blocking the event loop.
+
+    Records are rendered on the calling thread, usually the event loop, and the
+    lines are queued in memory; the event loop then writes all the queued lines in a
+    single call, using its default executor, so a slow output never blocks it. Only
+    one write is in progress at a time, so the lines are written in order. Outside of
+    a running event loop, the lines are written immediately.
+
+    Before the service stops, await `drain` or `aclose` to ensure all the lines are
+    delivered; pending lines are also written out when `asyncio.run` finishes, as it
+    waits for the default executor, and when the handler is closed on exit.
+
+    Args:
+        stream: The output stream; defaults to `sys.stderr`.
+        high_water: Size of queued output above which the asynchronous logging
+                    methods wait for it to be written.
+    """
+
+    def __init__(self, stream: TextIO | None = None, high_water: int = 1024 * 1024) -> None:
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stderr
+        self.high_water = high_water
+        self._pending: deque[str] = deque()
+        self._pending_size = 0
+        self._writing = False
+        self._write_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._idle = asyncio.Event()
+        SINKS.add(self)
+
+    @property
+    def pending_bytes(self) -> int:
+        """Size of the output waiting to be written."""
+        return self._pending_size
+
+    def emit(self, record: _std_logging.LogRecord) -> None:
+        """Queues the formatted record to be written from the event loop."""
+        try:
+            line = self.format(record) + "\n"
+            self._pending.append(line)
+            self._pending_size += len(line)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if self._loop is None or not self._loop.is_running():
+                if loop is None:
+                    self._write(self._take())
+                    return
+                self._attach(loop)
+            if not self._writing:
+                self._writing = True
+                if loop is self._loop:
+                    self._loop.call_soon(self._write_pending)  # type: ignore[union-attr]
+                else:
+                    self._loop.call_soon_threadsafe(self._write_pending)  # type: ignore[union-attr]
+        except RecursionError:
+            raise
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def _attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._writing = False
+        # events are bound to the loop they are first used in
+        self._idle = asyncio.Event()
+
+    def _take(self) -> str:
+        with self.lock:  # type: ignore[union-attr]
+            chunk = "".join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+        return chunk
+
+    def _write(self, chunk: str) -> None:
+        if not chunk:
+            return
+        with self._write_lock:
+            self.stream.write(chunk)
+            self.stream.flush()
+
+    def _write_pending(self, future: "asyncio.Future[None] | None" = None) -> None:
+        """Writes the queued lines in the executor, until there are none left."""
+        if future is not None and not future.cancelled() and future.exception() is not None:
+            traceback.print_exception(future.exception(), file=sys.stderr)
+        with self.lock:  # type: ignore[union-attr]
+            if not self._pending or self._loop is None or self._loop.is_closed():
+                self._writing = False
+                self._idle.set()
+                return
+        chunk = self._take()
+        try:
+            writing = self._loop.run_in_executor(None, self._write, chunk)
+        except RuntimeError:  # the executor is shut down, e.g. when `asyncio.run` finishes
+            self._write(chunk)
+            self._writing = False
+            self._idle.set()
+            return
+        writing.add_done_callback(self._write_pending)
+
+    async def drain(self) -> None:
+        """Waits until all the queued output is written."""
+        loop = asyncio.get_running_loop()
+        while self._loop is loop and self._writing:
+            self._idle.clear()
+            await self._idle.wait()
+        if self._pending:
+            self._write(self._take())
+
+    async def aclose(self) -> None:
+        """Writes out all the queued output and closes the handler."""
+        await self.drain()
+        self.close()
+
+    def flush(self) -> None:
+        """Writes out the queued output if the event loop is not running."""
+        if self._loop is None or not self._loop.is_running():
+            self._write(self._take())
+
+    def close(self) -> None:
+        """Writes out all the queued output and closes the handler."""
+        self._write(self._take())
+        SINKS.discard(self)
+        super().close()
+
+
+async def drain() -> None:
+    """Waits until all the output queued by the sinks on the running event loop is written."""
+    loop = asyncio.get_running_loop()
+    for sink in list(SINKS):
+        if sink._loop is loop:
+            await sink.drain()
+
+
+async def wait_for_capacity(sinks: Iterable[AsyncSink] | None = None) -> None:
+    """
+    Waits until the sinks on the running event loop have less output queued than allowed.
+
+    Args:
+        sinks: The sinks to wait for; defaults to all of them.
+    """
+    loop = asyncio.get_running_loop()
+    for sink in list(SINKS if sinks is None else sinks):
+        if sink._loop is loop and sink.pending_bytes > sink.high_water:
+            await sink.drain()
+
+
+def effective_sinks(logger: _std_logging.Logger) -> list[AsyncSink] | None:
+    """
+    Returns the handlers of a standard library logger, if all of them are sinks.
+
+    The handlers of the ancestor loggers are included, as long as the records are
+    propagated to them.
+
+    Args:
+        logger: The logger to check.
+    """
+    sinks: list[AsyncSink] = []
+    current: _std_logging.Logger | None = logger
+    while current is not None:
+        for handler in current.handlers:
+            if not isinstance(handler, AsyncSink):
+                return None
+            sinks.append(handler)
+        current = current.parent if current.propagate else None
+    return sinks or None
@@ -0,0 +1,306 @@
+"""Collection of log output from multiple processes over a Unix domain socket."""
+
+import json
+import logging as _std_logging
+import os
+import re
+import selectors
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO
+from weakref import WeakSet
+
+_COLLECTOR_HANDLERS: "WeakSet[CollectorHandler]" = WeakSet()
+
+_PID_KEY = re.compile(rb'"pid"\s*:')
+
+
+class CollectorHandler(_std_logging.Handler):
+    """
+    Handler sending the log output to a collector process over a Unix domain socket.
+
+    Lines are only appended to a local buffer by the logging threads; a background
+    thread sends them in batches, once the buffer grows over `batch_bytes`, on records
+    of `flush_level` or higher, and otherwise every `interval` seconds. If the
+    collector is unavailable, the lines are kept and the connection is retried every
+    `retry_interval` seconds; the buffer is limited to `max_bytes`, above which the
+    oldest lines are dropped and counted in the `dropped` attribute. As a batch is
+    sent again in full if the connection fails while sending it, some lines may be
+    delivered twice.
+
+    The handler is fork-safe: a forked child discards the lines buffered by its
+    parent, and opens its own connection to the collector.
+
+    Args:
+        path: Location of the collector socket.
+        max_bytes: Maximum size of the buffered output.
+        batch_bytes: Size of the buffered output that triggers sending it.
+        interval: Maximum time in seconds that a line can wait in the buffer.
+        retry_interval: Time in seconds between attempts to connect to the collector.
+        flush_level: Records of this level or higher are sent immediately.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = 4 * 1024 * 1024,
+        batch_bytes: int = 64 * 1024,
+        interval: float = 0.5,
+        retry_interval: float = 1.0,
+        flush_level: int = _std_logging.ERROR,
+    ) -> None:
+        super().__init__()
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.batch_bytes = batch_bytes
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.flush_level = flush_level
+        self.dropped = 0
+        self._reset()
+        _COLLECTOR_HANDLERS.add(self)
+
+    def _reset(self) -> None:
+        self._lines: deque[bytes] = deque()
+        self._size = 0
+        # the handler lock is never acquired while holding these, so `logging.shutdown`
+        # can call `flush` while holding it
+        self._buffer_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._socket: socket.socket | None = None
+        self._next_attempt = 0.0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def emit(self, record: _std_logging.LogRecord) -> None:
+        """Appends the formatted record to the buffer, without sending it."""
+        try:
+            line = self.format(record).encode() + b"\n"
+            with self._buffer_lock:
+                self._lines.append(line)
+                self._size += len(line)
+                self._trim()
+                full = self._size >= self.batch_bytes
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="unclogger-collector", daemon=True
+                )
+                self._flusher.start()
+            if full or record.levelno >= self.flush_level:
+                self._wakeup.set()
+        except RecursionError:
+            raise
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def _trim(self) -> None:
+        """Drops the oldest lines over the limit; the caller must hold the buffer lock."""
+        while self._size > self.max_bytes:
+            self._size -= len(self._lines.popleft())
+            self.dropped += 1
+
+    def _connect(self) -> socket.socket | None:
+        if self._socket is None and time.monotonic() >= self._next_attempt:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.retry_interval)
+            try:
+                connection.connect(self.path)
+                connection.sendall(b"%d\n" % os.getpid())
+            except OSError:
+                connection.close()
+                self._next_attempt = time.monotonic() + self.retry_interval
+            else:
+                self._socket = connection
+        return self._socket
+
+    def _send(self) -> None:
+        """Sends the buffered lines, or puts them back if the collector is unavailable."""
+        with self._send_lock:
+            with self._buffer_lock:
+                lines, self._lines = self._lines, deque()
+                size, self._size = self._size, 0
+            if not lines:
+                return
+            connection = self._connect()
+            if connection is not None:
+                try:
+                    connection.sendall(b"".join(lines))
+                except OSError:
+                    connection.close()
+                    self._socket = None
+                    self._next_attempt = time.monotonic() + self.retry_interval
+                else:
+                    return
+            with self._buffer_lock:
+                lines.extend(self._lines)
+                self._lines = lines
+                self._size += size
+                self._trim()
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self._send()
+
+    def flush(self) -> None:
+        """Sends the buffered lines, if the collector is available."""
+        self._next_attempt = 0.0
+        self._send()
+
+    def close(self) -> None:
+        """Sends the buffered lines and closes the connection."""
+        self._stopped.set()
+        self._wakeup.set()
+        self.flush()
+        with self._send_lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+        super().close()
+
+
+def _reset_collector_handlers() -> None:
+    # the child must not send the lines buffered by its parent, nor share its
+    # connection; the flusher thread does not survive the fork either
+    for handler in _COLLECTOR_HANDLERS:
+        if handler._socket is not None:
+            handler._socket.close()
+        handler._reset()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_collector_handlers)
+
+
+def _tag(line: bytes, prefix: bytes) -> bytes:
+    """Adds the pid field to the line, unless it is not an object or already has one."""
+    if line[:1] != b"{" or line == b"{}":
+        return line + b"\n"
+    # only the lines mentioning the field need to be parsed
+    if _PID_KEY.search(line):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict) or "pid" in record:
+            return line + b"\n"
+    return prefix + line[1:] + b"\n"
+
+
+class _Connection:
+    def __init__(self) -> None:
+        self.pid: bytes | None = None
+        self.buffer = b""
+
+
+class Collector:
+    """
+    Server merging the log output sent by `CollectorHandler` from multiple processes.
+
+    Every line is tagged with the `pid` field holding the ID of the sending process,
+    unless it already has a top-level field with that name, and written to a single
+    buffered output.
+
+        >>> from unclogger.collector import Collector
+        >>> Collector("/run/app/logs.sock").serve_forever()
+
+    Args:
+        path: Location of the socket; any existing file at that location is replaced.
+        output: Binary output stream; defaults to the standard output.
+        max_line_bytes: Maximum size of a single line; a client sending a longer
+                        line is disconnected.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        output: BinaryIO | None = None,
+        max_line_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.output = output if output is not None else sys.stdout.buffer
+        self.max_line_bytes = max_line_bytes
+        self._selector = selectors.DefaultSelector()
+        self._stopped = threading.Event()
+        self.path.unlink(missing_ok=True)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(self.path))
+        self._server.listen()
+        self._server.setblocking(False)
+        self._selector.register(self._server, selectors.EVENT_READ)
+
+    def _accept(self) -> None:
+        connection, _ = self._server.accept()
+        connection.setblocking(False)
+        self._selector.register(connection, selectors.EVENT_READ, _Connection())
+
+    def _disconnect(self, connection: socket.socket) -> None:
+        self._selector.unregister(connection)
+        connection.close()
+
+    def _receive(self, connection: socket.socket, state: _Connection) -> None:
+        try:
+            data = connection.recv(256 * 1024)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            # an incomplete last line of a closed connection is sent again after reconnecting
+            self._disconnect(connection)
+            return
+        lines = (state.buffer + data).split(b"\n")
+        state.buffer = lines.pop()
+        if len(state.buffer) > self.max_line_bytes:
+            self._disconnect(connection)
+            return
+        if state.pid is None:
+            if not lines:
+                return
+            state.pid = lines.pop(0)
+            if not state.pid.isdigit():
+                self._disconnect(connection)
+                return
+        prefix = b'{"pid": %s, ' % state.pid
+        self.output.write(b"".join(_tag(line, prefix) for line in lines if line))
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """
+        Receives and writes the log output until `shutdown` is called.
+
+        Args:
+            poll_interval: Time in seconds between checks for shutdown.
+        """
+        try:
+            while not self._stopped.is_set():
+                for key, _ in self._selector.select(poll_interval):
+                    if key.fileobj is self._server:
+                        self._accept()
+                        continue
+                    try:
+                        self._receive(key.fileobj, key.data)  # type: ignore[arg-type]
+                    except Exception:  # noqa: BLE001
+                        # a failing client must not stop the collection from the others
+                        self._disconnect(key.fileobj)  # type: ignore[arg-type]
+                self.output.flush()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Stops the `serve_forever` loop."""
+        self._stopped.set()
+
+    def close(self) -> None:
+        """Closes all connections and removes the socket."""
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()  # type: ignore[union-attr]
+        self._selector.close()
+        self.output.flush()
+        self.path.unlink(missing_ok=True)
@@ -7,6 +7,8 @@ from uuid import UUID
 
 from structlog.processors import _json_fallback_handler
 
+from unclogger.deferred import Lazy
+
 
 @singledispatch
 def json_default(value: Any) -> Any:
@@ -18,6 +20,7 @@ def json_default(value: Any) -> Any:
     * [UUID](https://docs.python.org/3/library/uuid.html#uuid.UUID)
     * [date](https://docs.python.org/3/library/datetime.html#date-objects)
     * [datetime](https://docs.python.org/3/library/datetime.html#datetime-objects)
+    * deferred values created by [lazy](reference.md#unclogger.lazy)
 
     Any unsupported values will be converted to text using the `repr` function.
     """
@@ -37,3 +40,9 @@ def _date(value: date) -> str:
 @json_default.register
 def _datetime(value: datetime) -> str:
     return value.isoformat() + "Z"
+
+
+@json_default.register
+def _lazy(value: Lazy) -> Any:
+    # nested values may be shared by several events, so the result is not memoised
+    return value.call()
@@ -0,0 +1,86 @@
+"""Deferred log values, computed only for events that are emitted."""
+
+from collections.abc import Callable
+from typing import Any
+
+from structlog.types import EventDict, WrappedLogger
+
+_UNRESOLVED = object()
+
+
+class Lazy:
+    """
+    A log value computed by calling a function, only when it is needed.
+
+    The result is memoised for each event, so the function is called at most once
+    even if the value is read by several processors; a value bound to a logger or to
+    the context is computed again for every event.
+    """
+
+    __slots__ = ("_args", "_func", "_kwargs", "_value")
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._value: Any = _UNRESOLVED
+
+    @property
+    def value(self) -> Any:
+        """The result of the function call."""
+        if self._value is _UNRESOLVED:
+            self._value = self._func(*self._args, **self._kwargs)
+        return self._value
+
+    def call(self) -> Any:
+        """Calls the function, without memoising the result."""
+        return self._func(*self._args, **self._kwargs)
+
+    def copy(self) -> "Lazy":
+        """Returns an unresolved copy, for memoising the value of a single event."""
+        return Lazy(self._func, *self._args, **self._kwargs)
+
+    def __repr__(self) -> str:
+        if self._value is _UNRESOLVED:
+            return f"<lazy {self._func!r}>"
+        return f"<lazy {self._value!r}>"
+
+
+def lazy(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Lazy:
+    """
+    Defers computing a log value until the event is actually emitted.
+
+        >>> from unclogger import get_logger, lazy
+        >>> logger = get_logger("unclogger")
+        >>> logger.debug("state", snapshot=lazy(expensive_dump, depth=3))
+
+    If the event is filtered out because of its level, or dropped by a processor,
+    the function is never called.
+
+    Args:
+        func: The callable computing the value.
+        args: Positional arguments passed to the callable.
+        kwargs: Keyword arguments passed to the callable.
+    """
+    return Lazy(func, *args, **kwargs)
+
+
+def copy_lazy(logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+    """
+    A Structlog processor giving the event its own copies of the deferred values.
+
+    Values bound to a logger or to the context are shared by all of its events, so
+    they are copied before they can be memoised.
+    """
+    for key, value in event_dict.items():
+        if isinstance(value, Lazy):
+            event_dict[key] = value.copy()
+    return event_dict
+
+
+def resolve_lazy(logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+    """A Structlog processor replacing deferred values with their results."""
+    for key, value in event_dict.items():
+        if isinstance(value, Lazy):
+            event_dict[key] = value.value
+    return event_dict
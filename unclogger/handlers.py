@@ -0,0 +1,184 @@
+"""Output handlers for the rendered log lines."""
+
+import logging as _std_logging
+import os
+import threading
+import time
+from typing import TextIO
+from weakref import WeakSet
+
+from unclogger.stdlib import bridge
+
+_BUFFERED_HANDLERS: "WeakSet[ThreadBufferedHandler]" = WeakSet()
+
+
+def set_handler(handler: _std_logging.Handler) -> None:
+    """
+    Replaces the handlers of the root logger with the given one.
+
+    Any handlers previously attached to the root logger, including the default one
+    installed by `unclogger`, are flushed and closed. If the handler has no formatter,
+    it is configured with `unclogger.bridge`, so records from standard library
+    loggers are rendered the same as the `unclogger` ones.
+
+    Args:
+        handler: The handler receiving all log output.
+    """
+    root = _std_logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+        existing.flush()
+        existing.close()
+    if handler.formatter is None:
+        bridge(handler)
+    root.addHandler(handler)
+
+
+class _Buffer:
+    """Rendered lines waiting to be written, owned by a single thread."""
+
+    def __init__(self) -> None:
+        self.owner = threading.current_thread()
+        self.lock = threading.Lock()
+        self.lines: list[str] = []
+        self.size = 0
+        self.flushed = time.monotonic()
+
+
+class ThreadBufferedHandler(_std_logging.StreamHandler):
+    """
+    Stream handler collecting the output of each thread in a separate buffer.
+
+    Instead of acquiring the shared handler lock for every record, each thread appends
+    its rendered lines to its own buffer, which is written to the stream in a single
+    call once it grows over `max_bytes`, or once `interval` seconds have passed since it
+    was last written out. Lines are only ever written whole, so the output of different
+    threads never interleaves within a line.
+
+    Buffers are flushed immediately on records of `flush_level` or higher, and by a
+    background thread once they become stale; `flush` writes out all of them, which is
+    also done on interpreter exit by `logging.shutdown`.
+
+    Args:
+        stream: The output stream; defaults to `sys.stderr`.
+        max_bytes: Size of a thread buffer that triggers writing it out.
+        interval: Maximum time in seconds that a line can wait in a buffer.
+        flush_level: Records of this level or higher are written out immediately.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        max_bytes: int = 64 * 1024,
+        interval: float = 1.0,
+        flush_level: int = _std_logging.ERROR,
+    ) -> None:
+        super().__init__(stream)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.flush_level = flush_level
+        self._reset()
+        _BUFFERED_HANDLERS.add(self)
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+        self._buffers: list[_Buffer] = []
+        self._registry_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def _buffer(self) -> _Buffer:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = _Buffer()
+            with self._registry_lock:
+                self._buffers.append(buffer)
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_periodically, name="unclogger-flusher", daemon=True
+                    )
+                    self._flusher.start()
+        return buffer
+
+    def handle(self, record: _std_logging.LogRecord) -> bool | _std_logging.LogRecord:  # type: ignore[override]
+        """Emits the record if it passes the filters, without acquiring the handler lock."""
+        result = self.filter(record)
+        if isinstance(result, _std_logging.LogRecord):
+            record = result
+        if result:
+            self.emit(record)
+        return result
+
+    def emit(self, record: _std_logging.LogRecord) -> None:
+        """Appends the formatted record to the buffer of the current thread."""
+        try:
+            line = self.format(record) + self.terminator
+            buffer = self._buffer()
+            with buffer.lock:
+                buffer.lines.append(line)
+                buffer.size += len(line)
+                full = (
+                    buffer.size >= self.max_bytes
+                    or record.levelno >= self.flush_level
+                    or time.monotonic() - buffer.flushed >= self.interval
+                )
+            if full:
+                self._write(buffer)
+        except RecursionError:
+            raise
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def _write(self, buffer: _Buffer) -> None:
+        """Writes out the buffer in a single call."""
+        # the handler lock is always acquired before a buffer lock, never the other way
+        # round, as `logging.shutdown` holds it while calling `flush`; taking the lines
+        # and writing them under the handler lock keeps the chunks of a thread in order
+        with self.lock:  # type: ignore[union-attr]
+            with buffer.lock:
+                buffer.flushed = time.monotonic()
+                if not buffer.lines:
+                    return
+                chunk = "".join(buffer.lines)
+                buffer.lines.clear()
+                buffer.size = 0
+            self.stream.write(chunk)
+            if hasattr(self.stream, "flush"):
+                self.stream.flush()
+
+    def _flush_buffers(self, stale_only: bool = False) -> None:
+        with self._registry_lock:
+            buffers = self._buffers[:]
+        now = time.monotonic()
+        for buffer in buffers:
+            if buffer.lines and (not stale_only or now - buffer.flushed >= self.interval):
+                self._write(buffer)
+            if not buffer.owner.is_alive() and not buffer.lines:
+                with self._registry_lock:
+                    self._buffers.remove(buffer)
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._flush_buffers(stale_only=True)
+
+    def flush(self) -> None:
+        """Writes out the buffers of all threads and flushes the stream."""
+        self._flush_buffers()
+        super().flush()
+
+    def close(self) -> None:
+        """Writes out all buffers and stops the background flushing."""
+        self._stopped.set()
+        self.flush()
+        super().close()
+
+
+def _reset_buffered_handlers() -> None:
+    # a forked child must neither repeat the lines still buffered by its parent, nor
+    # rely on locks or the flusher thread that were copied in an unknown state
+    for handler in _BUFFERED_HANDLERS:
+        handler._reset()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_buffered_handlers)
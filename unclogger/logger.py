@@ -1,13 +1,28 @@
 """Custom logger with structured logging capabilities."""
 
+import inspect
 import logging as _std_logging
+from collections.abc import Callable
 from types import SimpleNamespace
 from typing import Any, cast
 
 import structlog
 
+import unclogger.aio
 import unclogger.processors
-from unclogger.defaults import json_default
+import unclogger.profiles
+import unclogger.rendering
+import unclogger.templates
+import unclogger.testing
+from unclogger.deferred import copy_lazy, resolve_lazy
+
+# Parameters of `structlog.stdlib.BoundLogger._dispatch_to_sync` overridden by `Unclogger`.
+DISPATCH_PARAMETERS = ("self", "meth", "event", "args", "kw")
+
+
+def _overridable(cls: type, name: str, parameters: tuple[str, ...]) -> bool:
+    method = getattr(cls, name, None)
+    return method is not None and tuple(inspect.signature(method).parameters) == parameters
 
 
 # aliasing the type
@@ -21,6 +36,46 @@ class Unclogger(structlog.stdlib.BoundLogger):
             self._logger.config = SimpleNamespace()  # type: ignore[attr-defined]
         return self._logger.config  # type: ignore[attr-defined]
 
+    # relies on a private method of Structlog, so it is only overridden if that still
+    # has the expected signature; otherwise, the default implementation is used
+    if _overridable(structlog.stdlib.BoundLogger, "_dispatch_to_sync", DISPATCH_PARAMETERS):
+
+        async def _dispatch_to_sync(
+            self,
+            meth: Callable[..., Any],
+            event: str,
+            args: tuple[Any, ...],
+            kw: dict[str, Any],
+        ) -> None:
+            """
+            Runs the logging method for the asynchronous variants, e.g. `ainfo`.
+
+            By default, the logging method runs in a separate thread. If all the handlers
+            of the logger are `unclogger.aio.AsyncSink` instances, it runs directly on
+            the event loop instead, as the sinks don't block it; the call then only
+            waits if too much output is queued for writing.
+            """
+            sinks = unclogger.aio.effective_sinks(self._logger) if unclogger.aio.SINKS else None
+            if not sinks:
+                await super()._dispatch_to_sync(meth, event, args, kw)
+                return
+            meth(event, *args, **kw)
+            await unclogger.aio.wait_for_capacity(sinks)
+
+
+# Processors shared by native events and records from standard library loggers.
+RENDERING_PROCESSORS = [
+    copy_lazy,
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    unclogger.processors.run_custom_processors,
+    resolve_lazy,
+    structlog.processors.UnicodeDecoder(),
+    unclogger.testing.capture,
+    unclogger.profiles.project_fields,
+    unclogger.rendering.render_json,
+]
 
 structlog.configure(
     processors=[
@@ -28,13 +83,9 @@ structlog.configure(
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        unclogger.processors.run_custom_processors,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(default=json_default),
+        unclogger.templates.format_positional_args,
+        *RENDERING_PROCESSORS,
+        unclogger.rendering.mark_rendered,
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -0,0 +1,123 @@
+"""Output profiles for reducing the size of log events."""
+
+import logging as _std_logging
+from collections.abc import Iterable, Mapping
+
+from structlog.types import EventDict, WrappedLogger
+
+# Numeric codes used for the log levels when `level_codes` is enabled.
+LEVEL_CODES = {
+    "critical": _std_logging.CRITICAL,
+    "error": _std_logging.ERROR,
+    "warning": _std_logging.WARNING,
+    "info": _std_logging.INFO,
+    "debug": _std_logging.DEBUG,
+    "notset": _std_logging.NOTSET,
+}
+
+# Maximum number of distinct field names whose projection is remembered by a profile.
+PROFILE_CACHE_SIZE = 1024
+
+_EMPTY_TYPES = (str, bytes, list, tuple, dict, set, frozenset)
+
+_UNKNOWN: str = object()  # type: ignore[assignment]
+
+OUTPUT_PROFILE: dict[str, "OutputProfile | None"] = {"profile": None}
+
+
+class OutputProfile:
+    """
+    Selection and naming of the fields included in the log output.
+
+        >>> from unclogger import get_logger, set_output_profile
+        >>> from unclogger.profiles import OutputProfile
+        >>> set_output_profile(
+        ...     OutputProfile(exclude=["logger"], aliases={"timestamp": "ts"}, level_codes=True)
+        ... )
+        >>> get_logger("unclogger").info("message", foo=None)
+        {"foo": null, "event": "message", "level": 20, "ts": "..."}
+
+    The decision whether and under which name a field is included is made once for
+    each distinct field name, and reused for all subsequent events.
+
+    Args:
+        include: If given, only fields with these names are included.
+        exclude: Names of fields which are never included.
+        aliases: Mapping of field names to the names used in the output.
+        level_codes: Whether to replace log level names with their numeric values.
+        drop_empty: Whether to exclude the fields with `None` or empty values.
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] = (),
+        aliases: Mapping[str, str] | None = None,
+        level_codes: bool = False,
+        drop_empty: bool = False,
+    ) -> None:
+        self.include = frozenset(include) if include is not None else None
+        self.exclude = frozenset(exclude)
+        self.aliases = dict(aliases or {})
+        self.level_codes = level_codes
+        self.drop_empty = drop_empty
+        self._names: dict[str, str | None] = {}
+
+    def _name(self, key: str) -> str | None:
+        name = self._names.get(key, _UNKNOWN)
+        if name is _UNKNOWN:
+            excluded = key in self.exclude or (
+                self.include is not None and key not in self.include
+            )
+            name = None if excluded else self.aliases.get(key, key)
+            if len(self._names) < PROFILE_CACHE_SIZE:
+                self._names[key] = name
+        return name
+
+    def names(self, keys: Iterable[str]) -> tuple[str, ...]:
+        """Returns the output names of the given fields, omitting the excluded ones."""
+        return tuple(name for name in map(self._name, keys) if name is not None)
+
+    def __call__(self, event_dict: EventDict) -> EventDict:
+        """Returns the projected event."""
+        projected = {}
+        for key, value in event_dict.items():
+            name = self._name(key)
+            if name is None:
+                continue
+            if self.drop_empty and (
+                value is None or (isinstance(value, _EMPTY_TYPES) and not value)
+            ):
+                continue
+            if self.level_codes and key == "level":
+                value = LEVEL_CODES.get(value, value)
+            projected[name] = value
+        return projected
+
+
+def set_output_profile(profile: OutputProfile | None) -> None:
+    """
+    Sets the output profile used by all loggers.
+
+    A profile can also be set for an individual logger, using its `output_profile`
+    configuration option, which takes precedence over the global one:
+
+        >>> logger = get_logger("unclogger")
+        >>> logger.config.output_profile = OutputProfile(include=["event", "level"])
+
+    Args:
+        profile: The output profile; `None` removes the global profile.
+    """
+    OUTPUT_PROFILE["profile"] = profile
+
+
+def active_profile(logger: WrappedLogger) -> OutputProfile | None:
+    """Returns the output profile applied to the events of the given logger."""
+    profile = getattr(getattr(logger, "config", None), "output_profile", None)
+    return profile if profile is not None else OUTPUT_PROFILE["profile"]
+
+
+def project_fields(logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+    """A Structlog processor applying the configured output profile."""
+    profile = active_profile(logger)
+    return event_dict if profile is None else profile(event_dict)
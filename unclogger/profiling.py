@@ -0,0 +1,161 @@
+"""Profiling of memory allocations in the logging pipeline."""
+
+import logging as _std_logging
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from unclogger.logger import Unclogger, context_bind, context_clear, get_logger
+from unclogger.stdlib import bridge
+
+# Name of the logger used for the profiled events; it does not propagate to the root.
+PROFILE_LOGGER = "unclogger.profiling"
+
+# Allowed relative increase of allocations over the baseline.
+DEFAULT_TOLERANCE = 0.1
+
+
+def default_workload(logger: Unclogger, index: int) -> None:
+    """Logs a typical request event, with a per-request bound logger."""
+    logger.bind(request_id=f"req-{index}").info(
+        "request handled",
+        path="/api/items",
+        status=200,
+        duration=0.25,
+        user={"id": index, "roles": ["admin", "editor"]},
+    )
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.blocks = 0
+        self.calls = 0
+
+    def per_event(self, events: int, overhead: "_Stats | None" = None) -> dict[str, float]:
+        bytes_, blocks = self.bytes, self.blocks
+        if overhead is not None and overhead.calls:
+            bytes_ -= overhead.bytes * self.calls / overhead.calls
+            blocks -= overhead.blocks * self.calls / overhead.calls
+        return {"bytes": max(bytes_, 0) / events, "blocks": max(blocks, 0) / events}
+
+
+def _measure(stats: _Stats, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    blocks = sys.getallocatedblocks()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        stats.bytes += peak - before
+        stats.blocks += sys.getallocatedblocks() - blocks
+        stats.calls += 1
+
+
+def _noop(logger: Any, name: str, event_dict: Any) -> Any:
+    return event_dict
+
+
+def _stage_name(processor: Any) -> str:
+    return getattr(processor, "__name__", type(processor).__name__)
+
+
+def profile_allocations(
+    events: int = 1000, workload: Callable[[Unclogger, int], None] = default_workload
+) -> dict[str, Any]:
+    """
+    Measures the memory allocated by logging, in total and for each pipeline stage.
+
+    The workload is run twice with `tracemalloc` enabled: once to measure the total
+    allocations of each event, and once with every processor and the output handler
+    wrapped to measure them separately, less the cost of the measurement itself;
+    binding values to the logger in the workload is reported as the `bind` stage. The
+    total also includes the allocations outside of the stages, such as preparing the
+    event dictionary. For each stage, `bytes` is the peak memory
+    allocated while it runs, including the short-lived objects, and `blocks` is the
+    number of memory blocks still allocated when it returns, such as the event
+    dictionary copies passed on to the next stage. All values are averaged per event.
+
+    The output is discarded, and the logging configuration is restored afterwards.
+
+    Args:
+        events: Number of events to log in each run.
+        workload: Callable logging a single event with the given logger and index.
+    """
+    std_logger = _std_logging.getLogger(PROFILE_LOGGER)
+    std_logger.propagate = False
+    handler = bridge(_std_logging.StreamHandler(Path(os.devnull).open("w")))
+    std_logger.handlers = [handler]
+    processors = structlog.get_config()["processors"]
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    context_bind(service="profiling", version="1.0")
+    try:
+        logger = get_logger(PROFILE_LOGGER, level=_std_logging.DEBUG)
+        for index in range(min(events, 100)):  # warm up the caches
+            workload(logger, index)
+
+        total, overhead = _Stats(), _Stats()
+        for index in range(events):
+            _measure(total, workload, logger, index)
+            # calibration of the cost of measuring a single stage
+            _measure(overhead, _noop, logger, "info", {})
+
+        stages = {"bind": _Stats()}
+        stages.update((_stage_name(processor), _Stats()) for processor in processors)
+        stages["handler"] = _Stats()
+        structlog.configure(
+            processors=[
+                partial(_measure, stages[_stage_name(processor)], processor)
+                for processor in processors
+            ]
+        )
+        handler.handle = partial(_measure, stages["handler"], handler.handle)  # type: ignore[method-assign]
+        logger = get_logger(PROFILE_LOGGER, level=_std_logging.DEBUG)
+        logger.bind = partial(_measure, stages["bind"], logger.bind)  # type: ignore[method-assign]
+        for index in range(events):
+            workload(logger, index)
+    finally:
+        structlog.configure(processors=processors)
+        context_clear("service", "version")
+        if not tracing:
+            tracemalloc.stop()
+        std_logger.handlers = []
+        handler.close()
+        handler.stream.close()
+    return {
+        "events": events,
+        "total": total.per_event(events),
+        "stages": {name: stats.per_event(events, overhead) for name, stats in stages.items()},
+    }
+
+
+def check_allocations(
+    profile: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """
+    Compares the total memory allocated per event with a baseline.
+
+    Args:
+        profile: Result of `profile_allocations`.
+        baseline: An earlier result of `profile_allocations`.
+        tolerance: Allowed relative increase of allocations over the baseline.
+
+    Returns:
+        Description of the regression, or an empty list if there is none.
+    """
+    value, reference = profile["total"]["bytes"], baseline["total"]["bytes"]
+    if value <= reference * (1 + tolerance):
+        return []
+    return [
+        f"Allocated {value:.1f} bytes per event, exceeding the baseline of {reference:.1f}"
+        f" by more than {tolerance:.0%}."
+    ]
@@ -0,0 +1,18 @@
+"""Pytest plugin providing fixtures for asserting on log events.
+
+Enable it by adding `-p unclogger.pytest_plugin` to the pytest options, or by
+listing `"unclogger.pytest_plugin"` in `pytest_plugins` of the top-level `conftest.py`.
+"""
+
+from collections.abc import Iterator
+
+import pytest
+
+from unclogger.testing import CapturedEvents, capture_events
+
+
+@pytest.fixture
+def log_events() -> Iterator[CapturedEvents]:
+    """Captures the log events emitted during the test, without rendering them."""
+    with capture_events(render=False) as events:
+        yield events
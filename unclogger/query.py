@@ -0,0 +1,211 @@
+"""Querying of log files containing one JSON object per line."""
+
+import hashlib
+import json
+import mmap
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+# Suffix appended to the log file name to get the name of its index file.
+INDEX_SUFFIX = ".idx"
+
+# Number of lines covered by a single index entry.
+INDEX_STEP = 1000
+
+# Number of bytes at the beginning of the log file used to detect that it was replaced.
+HEAD_SIZE = 4096
+
+
+def index_path(path: str | Path) -> Path:
+    """
+    Returns the location of the index file of a log file.
+
+    Args:
+        path: Location of the log file.
+    """
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _head_digest(path: Path, size: int) -> str:
+    """Digest of the beginning of the file, which changes when the file is replaced."""
+    with path.open("rb") as log_file:
+        return hashlib.sha256(log_file.read(min(size, HEAD_SIZE))).hexdigest()
+
+
+def build_index(
+    path: str | Path, time_key: str = "timestamp", step: int = INDEX_STEP
+) -> dict[str, Any]:
+    """
+    Builds and saves the timestamp index of a log file.
+
+    The file is split into blocks of `step` lines, and the index stores the byte
+    range and the earliest and latest timestamp of each block, so that time-range
+    queries only need to read the blocks that overlap the range. Every line is parsed
+    once, so that only the top-level timestamp field is indexed; as the index stores
+    both limits of each block, the lines don't need to be strictly ordered by time.
+
+    Args:
+        path: Location of the log file.
+        time_key: Name of the timestamp field.
+        step: Number of lines in each block.
+    """
+    path = Path(path)
+    blocks: list[list[Any]] = []
+    with path.open("rb") as log_file:
+        start = offset = count = 0
+        first = last = None
+        for line in log_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            timestamp = record.get(time_key) if isinstance(record, dict) else None
+            if isinstance(timestamp, str):
+                first = timestamp if first is None else min(first, timestamp)
+                last = timestamp if last is None else max(last, timestamp)
+            offset += len(line)
+            count += 1
+            if count == step:
+                blocks.append([start, offset, first, last])
+                start, count, first, last = offset, 0, None, None
+        if count:
+            blocks.append([start, offset, first, last])
+    index = {
+        "time_key": time_key,
+        "size": offset,
+        "head": _head_digest(path, offset),
+        "blocks": blocks,
+    }
+    index_path(path).write_text(json.dumps(index))
+    return index
+
+
+def _load_index(path: Path, size: int, time_key: str) -> dict[str, Any] | None:
+    try:
+        index = json.loads(index_path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    # a shorter file has been truncated or rotated; a longer one was only appended to,
+    # unless its beginning has changed too
+    if index.get("time_key") != time_key or index.get("size", 0) > size:
+        return None
+    if index.get("head") != _head_digest(path, index["size"]):
+        return None
+    return index
+
+
+def _ranges(
+    index: dict[str, Any] | None, size: int, since: str | None, until: str | None
+) -> list[tuple[int, int]]:
+    if index is None or (since is None and until is None):
+        return [(0, size)]
+    ranges: list[tuple[int, int]] = []
+    for start, end, first, last in index["blocks"]:
+        if first is None or (since is not None and last < since):
+            continue
+        if until is not None and first >= until:
+            continue
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    if index["size"] < size:
+        ranges.append((index["size"], size))
+    return ranges
+
+
+def _lines(data: mmap.mmap, start: int, end: int, needle: bytes | None) -> Iterator[bytes]:
+    """Yields the lines within the range; only those containing the needle, if given."""
+    position = start
+    while position < end:
+        if needle is not None:
+            found = data.find(needle, position, end)
+            if found < 0:
+                return
+            position = data.rfind(b"\n", position, found) + 1 or position
+        line_end = data.find(b"\n", position, end)
+        if line_end < 0:
+            line_end = end
+        yield data[position:line_end]
+        position = line_end + 1
+
+
+def _needles(criteria: dict[str, list[Any]]) -> list[bytes]:
+    """Byte strings that have to appear in every matching line, most selective first."""
+    needles = [
+        json.dumps(values[0]).encode()
+        for values in criteria.values()
+        if len(values) == 1 and not isinstance(values[0], (bool, int, float))
+    ]
+    return sorted(needles, key=len, reverse=True)
+
+
+def _matches(
+    record: Any,
+    criteria: dict[str, list[Any]],
+    since: str | None,
+    until: str | None,
+    time_key: str,
+) -> bool:
+    if not isinstance(record, dict):
+        return False
+    if any(record.get(key) not in values for key, values in criteria.items()):
+        return False
+    if since is None and until is None:
+        return True
+    timestamp = record.get(time_key)
+    return (
+        isinstance(timestamp, str)
+        and (since is None or timestamp >= since)
+        and (until is None or timestamp < until)
+    )
+
+
+def query(
+    path: str | Path,
+    fields: dict[str, list[Any]] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    time_key: str = "timestamp",
+) -> Iterator[bytes]:
+    """
+    Finds the log lines matching all of the given criteria.
+
+    The file is memory-mapped, and only the lines containing the encoded values of
+    the criteria are parsed; if the file has an index built by `build_index`, only
+    the blocks overlapping the time range are read.
+
+        >>> from unclogger.query import query
+        >>> for line in query("app.log", {"level": ["error"]}, since="2021-02-12T22:00"):
+        ...     print(line.decode())
+
+    Args:
+        path: Location of the log file.
+        fields: Accepted values of each field to be matched.
+        since: The earliest accepted timestamp.
+        until: The timestamps must be earlier than this.
+        time_key: Name of the timestamp field.
+    """
+    criteria = {key: list(values) for key, values in (fields or {}).items()}
+    needles = _needles(criteria)
+    path = Path(path)
+    size = path.stat().st_size
+    if not size:
+        return
+    index = _load_index(path, size, time_key) if since or until else None
+    with (
+        path.open("rb") as log_file,
+        mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        for start, end in _ranges(index, size, since, until):
+            for line in _lines(data, start, end, needles[0] if needles else None):
+                if not line.strip() or any(needle not in line for needle in needles[1:]):
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if _matches(record, criteria, since, until, time_key):
+                    yield line
@@ -0,0 +1,221 @@
+"""Rendering of event dictionaries into JSON text."""
+
+import json
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, MappingView, Set
+from itertools import chain
+from typing import Any
+
+import structlog
+from structlog.types import EventDict, WrappedLogger
+
+from unclogger.defaults import json_default
+from unclogger.profiles import active_profile
+
+# Key used for the truncation marker inside mappings, including the event itself.
+TRUNCATED_KEY = "__truncated__"
+
+# Smallest budget accepted by `set_size_limits`; anything lower can't fit the markers.
+MIN_SIZE_LIMIT = 128
+
+# Standard fields that get budget precedence over user-supplied ones.
+PRIORITY_KEYS = ("event", "logger", "level", "timestamp")
+
+# Attribute of a `logging.LogRecord` holding its rendering; `True` if it is the message itself.
+RENDERED_ATTRIBUTE = "unclogger_rendered"
+
+SIZE_LIMITS: dict[str, int | None] = {"field": None, "event": None}
+
+_json_renderer = structlog.processors.JSONRenderer(default=json_default)
+
+
+def set_size_limits(field: int | None = None, event: int | None = None) -> None:
+    """
+    Sets the byte budgets enforced when rendering log events.
+
+    Oversized values are truncated while being encoded, so large payloads are
+    never serialised in full. Truncated strings and byte strings end with a marker
+    stating their original length, while truncated containers get an additional
+    marker item stating how many of their items were kept; sets, deques and
+    dictionary views are encoded as lists. Calling the function without any
+    arguments removes the limits.
+
+    Args:
+        field: Maximum size of each top-level value in the rendered output.
+        event: Maximum size of the whole rendered event.
+
+    Raises:
+        ValueError if any of the limits is lower than `MIN_SIZE_LIMIT`.
+    """
+    for limit in (field, event):
+        if limit is not None and limit < MIN_SIZE_LIMIT:
+            raise ValueError(f"Size limit must be at least {MIN_SIZE_LIMIT}, got {limit}")  # noqa: TRY003
+    SIZE_LIMITS["field"] = field
+    SIZE_LIMITS["event"] = event
+
+
+def render_json(logger: WrappedLogger, name: str, event_dict: EventDict) -> str:
+    """A Structlog processor rendering the event as JSON, within configured size limits."""
+    field_limit, event_limit = SIZE_LIMITS["field"], SIZE_LIMITS["event"]
+    if field_limit is None and event_limit is None:
+        return _json_renderer(logger, name, event_dict)
+    # the event has already been projected, so the standard fields may have been renamed
+    profile = active_profile(logger)
+    priority = PRIORITY_KEYS if profile is None else profile.names(PRIORITY_KEYS)
+    return bounded_dumps(event_dict, field_limit, event_limit, priority=priority)
+
+
+def mark_rendered(
+    logger: WrappedLogger, name: str, rendered: str
+) -> tuple[tuple[str], dict[str, Any]]:
+    """
+    A Structlog processor passing the rendered event to the standard library logger.
+
+    The resulting `logging.LogRecord` is marked as already rendered, so that it is
+    not processed again by `unclogger.stdlib.UncloggerFormatter`.
+    """
+    return (rendered,), {"extra": {RENDERED_ATTRIBUTE: True}}
+
+
+def bounded_dumps(
+    event_dict: EventDict,
+    field_limit: int | None = None,
+    event_limit: int | None = None,
+    default: Callable[[Any], Any] = json_default,
+    priority: Iterable[str] = PRIORITY_KEYS,
+) -> str:
+    """
+    Serialises an event dictionary to JSON, truncating it to fit the given budgets.
+
+    The output is formatted the same as `json.dumps` with default arguments; as
+    that escapes all non-ASCII characters, the length of the output is also its
+    size in bytes.
+
+    Args:
+        event_dict: The event to serialise.
+        field_limit: Maximum size of each top-level value.
+        event_limit: Maximum size of the whole output.
+        default: Formatter for values not supported by the `json` library.
+        priority: Names of the fields that get budget precedence over the others.
+    """
+    budget = event_limit if event_limit is not None else float("inf")
+    return _encode_mapping(event_dict, budget, default, field_limit, priority)
+
+
+def _marker(kept: int, total: int, unit: str) -> str:
+    return f"<truncated: {kept} of {total} {unit}>"
+
+
+def _encode(value: Any, budget: float, default: Callable[[Any], Any]) -> str:
+    """Encodes a value; the result is longer than `budget` only if it can't be made to fit."""
+    if isinstance(value, str):
+        return _encode_str(value, budget)
+    if value is None or isinstance(value, (bool, int, float)):
+        return json.dumps(value)
+    if isinstance(value, dict):
+        return _encode_mapping(value, budget, default)
+    if isinstance(value, (list, tuple, Set, MappingView, deque)):
+        return _encode_sequence(value, budget, default)
+    if isinstance(value, (bytes, bytearray)):
+        return _encode_bytes(value, budget)
+    converted = default(value)
+    if converted is value:
+        converted = repr(value)
+    return _encode(converted, budget, default)
+
+
+def _encode_str(value: str, budget: float) -> str:
+    # the encoded string is never shorter than the original, so this avoids encoding it
+    # in full when it is obviously too long
+    if len(value) + 2 <= budget:
+        encoded = json.dumps(value)
+        if len(encoded) <= budget:
+            return encoded
+    return _truncate_str(value, budget, f"<truncated: {len(value)} chars>")
+
+
+def _truncate_str(value: str, budget: float, marker: str) -> str:
+    keep = max(int(budget) - len(marker) - 2, 0)
+    encoded = json.dumps(value[:keep] + marker)
+    while keep and len(encoded) > budget:
+        # escaped characters take more than one byte; each removed character
+        # shortens the output by at least one, so this converges quickly
+        keep = max(keep - (len(encoded) - int(budget)), 0)
+        encoded = json.dumps(value[:keep] + marker)
+    return encoded
+
+
+def _encode_bytes(value: bytes | bytearray, budget: float) -> str:
+    # the representation is never shorter than the value, so only the part that
+    # can possibly fit is converted
+    if len(value) + 2 <= budget:
+        encoded = json.dumps(repr(value))
+        if len(encoded) <= budget:
+            return encoded
+    marker = f"<truncated: {len(value)} bytes>"
+    return _truncate_str(repr(value[: int(budget)]), budget, marker)
+
+
+def _encode_sequence(value: Collection, budget: float, default: Callable[[Any], Any]) -> str:
+    total = len(value)
+    reserve = len(json.dumps(_marker(total, total, "items"))) + 2
+    limit = budget - reserve
+    parts: list[str] = []
+    used = 2
+    for item in value:
+        separator = 2 if parts else 0
+        remaining = limit - used - separator
+        if remaining <= 0:
+            break
+        encoded = _encode(item, remaining, default)
+        if len(encoded) > remaining:
+            break
+        parts.append(encoded)
+        used += separator + len(encoded)
+    else:
+        return "[" + ", ".join(parts) + "]"
+    parts.append(json.dumps(_marker(len(parts), total, "items")))
+    return "[" + ", ".join(parts) + "]"
+
+
+def _encode_key(key: Any) -> str:
+    if isinstance(key, str):
+        return json.dumps(key)
+    if key is None or isinstance(key, (bool, int, float)):
+        # the same conversion as `json.dumps`, e.g. `True` to `"true"`
+        return json.dumps(json.dumps(key))
+    return json.dumps(str(key))
+
+
+def _encode_mapping(
+    value: dict,
+    budget: float,
+    default: Callable[[Any], Any],
+    field_limit: int | None = None,
+    priority: Iterable[str] = (),
+) -> str:
+    total = len(value)
+    reserve = (
+        len(f"{json.dumps(TRUNCATED_KEY)}: {json.dumps(_marker(total, total, 'keys'))}") + 2
+    )
+    limit = budget - reserve
+    first = [key for key in priority if key in value]
+    keys = chain(first, (key for key in value if key not in first))
+    parts: dict[Any, str] = {}
+    used = 2
+    for key in keys:
+        name = _encode_key(key)
+        remaining = limit - used - len(name) - 2 - (2 if parts else 0)
+        if remaining <= 0:
+            break
+        cap = remaining if field_limit is None else min(remaining, field_limit)
+        encoded = _encode(value[key], cap, default)
+        if len(encoded) > cap:
+            continue
+        parts[key] = f"{name}: {encoded}"
+        used += len(parts[key]) + (2 if len(parts) > 1 else 0)
+    items = [parts[key] for key in value if key in parts] if priority else list(parts.values())
+    if len(parts) < total:
+        marker = json.dumps(_marker(len(parts), total, "keys"))
+        items.append(f"{json.dumps(TRUNCATED_KEY)}: {marker}")
+    return "{" + ", ".join(items) + "}"
@@ -0,0 +1,99 @@
+"""Rendering of records from standard library loggers."""
+
+import logging as _std_logging
+from collections.abc import Mapping
+from typing import Any
+
+import structlog
+
+from unclogger.logger import RENDERING_PROCESSORS
+from unclogger.rendering import RENDERED_ATTRIBUTE
+from unclogger.templates import format_positional_args
+
+
+def render_record(record: _std_logging.LogRecord) -> str | bool:
+    """
+    Renders a log record through the `unclogger` processors.
+
+    Records emitted by `unclogger` loggers are already rendered and are left
+    unchanged; records from other loggers are converted to event dictionaries and
+    rendered the same way. The result is stored on the record, so it is rendered
+    only once regardless of the number of handlers.
+
+    Args:
+        record: The record to render.
+
+    Returns:
+        The rendered record, `True` if the record message is already rendered, or
+        `False` if the event was dropped by a processor.
+    """
+    rendered = getattr(record, RENDERED_ATTRIBUTE, None)
+    if rendered is None:
+        try:
+            rendered = _render_foreign(record)
+        except structlog.DropEvent:
+            rendered = False
+        setattr(record, RENDERED_ATTRIBUTE, rendered)
+    return rendered
+
+
+def _render_foreign(record: _std_logging.LogRecord) -> str:
+    method_name = record.levelname.lower()
+    if isinstance(record.msg, str):
+        event, args = record.msg, record.args
+    else:
+        event, args = record.getMessage(), None
+    event_dict: dict[str, Any] = {"event": event, "logger": record.name, "level": method_name}
+    if args:
+        event_dict["positional_args"] = (args,) if isinstance(args, Mapping) else args
+    if record.exc_info:
+        event_dict["exc_info"] = record.exc_info
+    if record.stack_info:
+        event_dict["stack"] = record.stack_info
+
+    logger = _std_logging.getLogger(record.name)
+    event_dict = structlog.contextvars.merge_contextvars(logger, method_name, event_dict)
+    event_dict = format_positional_args(logger, method_name, event_dict)
+    for processor in RENDERING_PROCESSORS:
+        event_dict = processor(logger, method_name, event_dict)
+    return event_dict  # type: ignore[return-value]
+
+
+class UncloggerFormatter(_std_logging.Formatter):
+    """
+    Formatter rendering all records as `unclogger` JSON output.
+
+    Records from `unclogger` loggers are passed through as they are, while records
+    from other loggers (e.g. third-party libraries using the standard `logging`
+    module) are rendered through the same processors, so the output consists of
+    uniformly structured lines.
+    """
+
+    def format(self, record: _std_logging.LogRecord) -> str:
+        """Returns the rendered record."""
+        rendered = render_record(record)
+        if rendered is True:
+            return record.getMessage()
+        return rendered or ""
+
+
+def is_rendered(record: _std_logging.LogRecord) -> bool:
+    """
+    A logging filter rejecting the records dropped by the `unclogger` processors.
+
+    Args:
+        record: The record to check.
+    """
+    return render_record(record) is not False
+
+
+def bridge(handler: _std_logging.Handler) -> _std_logging.Handler:
+    """
+    Configures a logging handler to emit all records as `unclogger` JSON output.
+
+    Args:
+        handler: The handler to configure.
+    """
+    handler.setFormatter(UncloggerFormatter())
+    handler.addFilter(is_rendered)
+    return handler
@@ -0,0 +1,59 @@
+"""Formatting of log messages with positional arguments."""
+
+from collections.abc import Mapping
+
+from structlog.types import EventDict, WrappedLogger
+
+TEMPLATE_FIELDS = {"enabled": False}
+
+
+def set_template_fields(enabled: bool = True) -> None:
+    """
+    Sets whether message templates are included in the log output.
+
+    When enabled, messages logged with positional arguments keep the original
+    template in the `template` field, and the arguments in the `positional_args`
+    field, so log aggregation can group messages by template.
+
+        >>> from unclogger import get_logger, set_template_fields
+        >>> set_template_fields()
+        >>> get_logger("unclogger").info("user %s logged in", "alice")
+        {"event": "user alice logged in", ..., "template": "user %s logged in", "positional_args": ["alice"], ...}
+
+    Args:
+        enabled: Whether to include the template fields.
+    """
+    TEMPLATE_FIELDS["enabled"] = enabled
+
+
+def format_positional_args(
+    logger: WrappedLogger, name: str, event_dict: EventDict
+) -> EventDict:
+    """
+    A Structlog processor applying positional arguments to the message template.
+
+    As in standard logging, a single non-empty mapping argument is used for the named
+    placeholders. Unlike standard logging, a mismatch between the template and the
+    arguments does not raise an error; the message is kept unformatted, and the
+    arguments are included in the `positional_args` field instead.
+
+    The template fields never replace keyword arguments with the same names.
+    """
+    args = event_dict.get("positional_args")
+    event = event_dict.get("event")
+    # Structlog passes the positional arguments as a tuple; anything else is a keyword argument
+    if not isinstance(args, tuple) or not isinstance(event, str):
+        return event_dict
+    del event_dict["positional_args"]
+    if not args:
+        return event_dict
+    values = args[0] if len(args) == 1 and isinstance(args[0], Mapping) and args[0] else args
+    try:
+        event_dict["event"] = event % values
+    except (TypeError, ValueError, KeyError):
+        event_dict["positional_args"] = values
+        return event_dict
+    if TEMPLATE_FIELDS["enabled"]:
+        event_dict.setdefault("template", event)
+        event_dict["positional_args"] = values
+    return event_dict
@@ -0,0 +1,81 @@
+"""Helpers for asserting on log events in tests."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import structlog
+from structlog.types import EventDict, WrappedLogger
+
+_CAPTURES: list[tuple["CapturedEvents", bool]] = []
+
+
+class CapturedEvents(list):
+    """List of captured event dictionaries, with helpers for querying them."""
+
+    def filter(
+        self, level: str | None = None, logger: str | None = None, **fields: Any
+    ) -> "CapturedEvents":
+        """
+        Selects the events matching all the given criteria.
+
+        Args:
+            level: Name of the log level, e.g. `"info"`.
+            logger: Name of the logger that emitted the event.
+            fields: Values of any other fields in the event.
+        """
+        if level is not None:
+            fields["level"] = level.lower()
+        if logger is not None:
+            fields["logger"] = logger
+        return CapturedEvents(
+            event
+            for event in self
+            if all(key in event and event[key] == value for key, value in fields.items())
+        )
+
+    @property
+    def messages(self) -> list[Any]:
+        """Messages of the captured events."""
+        return [event.get("event") for event in self]
+
+
+@contextmanager
+def capture_events(render: bool = True) -> Iterator[CapturedEvents]:
+    """
+    Captures the log events while the context is active.
+
+    The events are captured as dictionaries after all processors have run, just
+    before they are rendered to JSON.
+
+        >>> from unclogger import get_logger
+        >>> from unclogger.testing import capture_events
+        >>> with capture_events(render=False) as events:
+        ...     get_logger("unclogger").info("message", foo="abc")
+        >>> events.filter(level="info", foo="abc").messages
+        ['message']
+
+    Args:
+        render: If false, the captured events are neither rendered nor emitted,
+                which saves time when the output is not needed.
+    """
+    capture = (CapturedEvents(), render)
+    _CAPTURES.append(capture)
+    try:
+        yield capture[0]
+    finally:
+        # the captured lists compare by content, so the capture is found by identity
+        del _CAPTURES[next(index for index, item in enumerate(_CAPTURES) if item is capture)]
+
+
+def capture(logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+    """A Structlog processor storing the event in any active captures."""
+    if not _CAPTURES:
+        return event_dict
+    render = False
+    for events, render_events in _CAPTURES:
+        events.append(event_dict)
+        render = render or render_events
+    if not render:
+        raise structlog.DropEvent
+    return event_dict